@@ -0,0 +1,135 @@
+import os
+import numpy as np
+from multiprocessing import get_context, shared_memory
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from bfs import BFS
+from dijkstra import Dijkstra
+from conversion import to_csr
+from type_presentation import CompressedSparseRow
+
+
+# состояние процесса-исполнителя: подключённые блоки общей памяти, движок поиска и матрица результата
+_worker = {}
+
+
+def _init_worker(arrays, output, weighted):
+    blocks = []
+    views = []
+    for name, dtype, shape in arrays:
+        block = shared_memory.SharedMemory(name=name)
+        blocks.append(block)
+        views.append(np.ndarray(shape, dtype=dtype, buffer=block.buf))
+
+    kind, location, dtype, shape = output
+    if kind == "shm":
+        block = shared_memory.SharedMemory(name=location)
+        blocks.append(block)
+        result = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+    else:
+        result = np.memmap(location, dtype=dtype, mode="r+", shape=shape)
+
+    csr = CompressedSparseRow(*views)
+    _worker.update(blocks=blocks, result=result, weighted=weighted,
+                   engine=Dijkstra(csr) if weighted else BFS(csr))
+
+
+def _release_worker():
+    blocks = _worker.pop("blocks", [])
+    _worker.clear()
+    for block in blocks:
+        block.close()
+
+
+def _solve_rows(first, last):
+    engine, result = _worker["engine"], _worker["result"]
+    for source in range(first, last):
+        if _worker["weighted"]:
+            result[source] = engine.distances(source)
+        else:
+            result[source] = engine.frontier_tree(source).distances
+    if isinstance(result, np.memmap):
+        result.flush()
+    return first, last
+
+
+class AllPairs():
+    """
+    Кратчайшие расстояния между всеми парами вершин в нескольких процессах
+
+    Граф приводится к CSR, и его массивы один раз кладутся в общую память (multiprocessing.shared_memory),
+    так что процессы подключаются к ним по имени, не получая копий. Начальные вершины делятся на куски
+    между процессами; каждый процесс пишет свои строки прямо в общую матрицу результата или,
+    если задан путь out, в файл, отображённый в память (np.memmap) — для матриц, которые не помещаются в RAM.
+    Без весов считается число переходов (int32, -1 — недостижимо), с весами — Дейкстрой (float64, inf — недостижимо).
+    Если процесс-исполнитель падает, оставшиеся куски отменяются, общая память освобождается и поднимается RuntimeError.
+    """
+    def __init__(self, data, processes=None, chunk_size=None):
+        self.data = data
+        self.processes = processes
+        self.chunk_size = chunk_size
+
+    def distances(self, weighted=False, out=None, data=None) -> np.ndarray:
+        if data is not None:
+            self.data = data
+        csr = to_csr(self.data)
+        num_nodes = len(csr)
+        shape = (num_nodes, num_nodes)
+        dtype = np.dtype(np.float64 if weighted else np.int32)
+
+        blocks = []
+        result = None
+        try:
+            arrays = [self._share(array, blocks) for array in (csr.indptr, csr.indices, csr.weights)]
+            if out is None:
+                block = shared_memory.SharedMemory(create=True, size=max(dtype.itemsize * num_nodes * num_nodes, 1))
+                blocks.append(block)
+                result = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+                output = ("shm", block.name, dtype, shape)
+            else:
+                result = np.memmap(out, dtype=dtype, mode="w+", shape=shape)
+                output = ("memmap", out, dtype, shape)
+
+            self._run(arrays, output, weighted, num_nodes)
+            if out is not None:
+                result.flush()
+                return result
+            return result.copy()
+        finally:
+            # представления поверх общей памяти должны исчезнуть до её закрытия
+            del result
+            for block in blocks:
+                block.close()
+                block.unlink()
+
+    def _run(self, arrays, output, weighted, num_nodes):
+        processes = self.processes or os.cpu_count() or 1
+        chunk_size = self.chunk_size or max(1, num_nodes // (processes * 4))
+        ranges = [(first, min(first + chunk_size, num_nodes)) for first in range(0, num_nodes, chunk_size)]
+
+        if processes == 1:
+            _init_worker(arrays, output, weighted)
+            try:
+                for first, last in ranges:
+                    _solve_rows(first, last)
+            finally:
+                _release_worker()
+            return
+
+        with ProcessPoolExecutor(max_workers=processes, mp_context=get_context(), initializer=_init_worker,
+                                 initargs=(arrays, output, weighted)) as pool:
+            futures = [pool.submit(_solve_rows, first, last) for first, last in ranges]
+            try:
+                for future in as_completed(futures):
+                    future.result()
+            except Exception as error:
+                for future in futures:
+                    future.cancel()
+                raise RuntimeError("all-pairs worker failed") from error
+
+    @staticmethod
+    def _share(array, blocks):
+        array = np.ascontiguousarray(array)
+        block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        blocks.append(block)
+        np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+        return block.name, array.dtype, array.shape
@@ -0,0 +1,74 @@
+import heapq
+import numpy as np
+from search_tree import SearchTree
+from dijkstra import Dijkstra
+
+
+def euclidean(coordinates, indexes, end):
+    return np.sqrt(((coordinates[indexes] - coordinates[end]) ** 2).sum(axis=-1))
+
+
+def manhattan(coordinates, indexes, end):
+    return np.abs(coordinates[indexes] - coordinates[end]).sum(axis=-1)
+
+
+METRICS = {
+    "euclidean": euclidean,
+    "manhattan": manhattan,
+}
+
+
+class AStar(Dijkstra):
+    """
+    Поиск A*
+
+    Как Дейкстра, но вершины снимаются с кучи по сумме пройденного веса и оценки оставшегося пути,
+    поэтому поиск идёт в сторону цели. Оценка задаётся либо функцией heuristic(indexes, end),
+    которая получает массив вершин и возвращает массив оценок, либо массивом координат вершин
+    (форма V x d) и метрикой "euclidean"/"manhattan" — тогда оценки считаются векторно для всех соседей сразу.
+    Для кратчайшего пути оценка не должна превышать настоящий остаток пути (координаты в тех же единицах, что и веса).
+    Без оценки поиск совпадает с алгоритмом Дейкстры.
+    """
+    def __init__(self, data, heuristic=None, coordinates=None, metric="euclidean"):
+        super().__init__(data)
+        if heuristic is None and coordinates is not None:
+            if metric not in METRICS:
+                raise ValueError(f"invalid metric ({metric})")
+            coordinates = np.asarray(coordinates, dtype=np.float64)
+            heuristic = lambda indexes, end: METRICS[metric](coordinates, indexes, end)
+        self.heuristic = heuristic
+
+    def search_tree(self, start, end=None) -> SearchTree:
+        if end is None or self.heuristic is None:
+            return super().search_tree(start, end)
+
+        csr = self._weighted_csr()
+        distances = np.full(len(csr), np.inf)
+        parents = np.full(len(csr), -1, dtype=np.int64)
+        distances[start] = 0
+
+        heap = [(float(self.heuristic(np.array([start]), end)[0]), 0.0, start)]
+        while heap:
+            _, distance, index = heapq.heappop(heap)
+            # устаревшая запись: вершину уже достигли дешевле
+            if distance > distances[index]:
+                continue
+            if index == end:
+                break
+
+            begin, stop = csr.indptr[index], csr.indptr[index + 1]
+            need_indexes = csr.indices[begin:stop]
+            candidates = distance + csr.weights[begin:stop]
+            improved = candidates < distances[need_indexes]
+            if not improved.any():
+                continue
+            need_indexes, candidates = need_indexes[improved], candidates[improved]
+            np.minimum.at(distances, need_indexes, candidates)
+            won = distances[need_indexes] == candidates
+            need_indexes, candidates = need_indexes[won], candidates[won]
+            parents[need_indexes] = index
+            estimates = candidates + np.asarray(self.heuristic(need_indexes, end), dtype=np.float64)
+            for estimate, new_distance, new_index in zip(estimates.tolist(), candidates.tolist(),
+                                                         need_indexes.tolist()):
+                heapq.heappush(heap, (estimate, new_distance, new_index))
+        return SearchTree(start, parents, distances)
@@ -0,0 +1,93 @@
+import numpy as np
+from dataclasses import dataclass
+from bfs import BFS
+
+
+@dataclass
+class BatchResult:
+    """
+    Ответы на пакет запросов (start, end)
+
+    Атрибуты:
+        distances (np.ndarray) - расстояние для каждой пары (-1 или inf, если end недостижима)
+        ways (np.ndarray) - пути построчно, дополненные справа значением -1 (форма число пар x длина самого длинного пути)
+        lengths (np.ndarray) - число вершин в каждом пути (0, если пути нет)
+    """
+    distances: np.ndarray
+    ways: np.ndarray
+    lengths: np.ndarray
+
+    def way(self, index) -> list:
+        """Путь для пары с номером index или None."""
+        if self.lengths[index] == 0:
+            return None
+        return self.ways[index, :self.lengths[index]].tolist()
+
+
+class BatchQuery():
+    """
+    Пакетные запросы путей
+
+    Пары группируются по начальной вершине: для каждой различной начальной вершины выполняется
+    один полный обход движка (BFS, DFS, Dijkstra и т. п. — любой класс с методом search_tree),
+    а все конечные вершины группы отвечаются по массивам родителей и расстояний этого обхода.
+    """
+    def __init__(self, data, engine=BFS):
+        self.engine = engine(data)
+
+    def finding_ways(self, pairs, data=None, ways=True) -> BatchResult:
+        if data is not None:
+            self.engine.data = data
+        pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+        order = np.argsort(pairs[:, 0], kind="stable")
+        sources, group_starts = np.unique(pairs[order, 0], return_index=True)
+        group_ends = np.append(group_starts[1:], len(order))
+
+        distances = None
+        reversed_ways = []
+        lengths = np.zeros(len(pairs), dtype=np.int64)
+        for source, group_start, group_end in zip(sources.tolist(), group_starts, group_ends):
+            group = order[group_start:group_end]
+            tree = self.engine.search_tree(source)
+            targets = pairs[group, 1]
+            if distances is None:
+                distances = np.empty(len(pairs), dtype=tree.distances.dtype)
+            distances[group] = tree.distances[targets]
+            if ways:
+                group_ways, lengths[group] = self._trace_back(tree, targets)
+                reversed_ways.append((group, group_ways))
+
+        if distances is None:
+            distances = np.empty(0, dtype=np.int64)
+        return BatchResult(distances, self._assemble(reversed_ways, lengths), lengths)
+
+    def distances(self, pairs, data=None) -> np.ndarray:
+        return self.finding_ways(pairs, data=data, ways=False).distances
+
+    @staticmethod
+    def _trace_back(tree, targets):
+        """Поднимается по родителям от всех конечных вершин группы одновременно; пути получаются перевёрнутыми."""
+        current = targets.copy()
+        alive = (targets == tree.source) | (tree.parents[targets] != -1)
+        lengths = np.zeros(len(targets), dtype=np.int64)
+        columns = []
+        while alive.any():
+            columns.append(np.where(alive, current, -1))
+            lengths += alive
+            current = np.where(alive, tree.parents[current], -1)
+            alive &= current != -1
+        if not columns:
+            return np.empty((len(targets), 0), dtype=np.int64), lengths
+        return np.column_stack(columns), lengths
+
+    @staticmethod
+    def _assemble(reversed_ways, lengths) -> np.ndarray:
+        ways = np.full((len(lengths), int(lengths.max(initial=0))), -1, dtype=np.int64)
+        for group, group_ways in reversed_ways:
+            if group_ways.shape[1] == 0:
+                continue
+            # разворачиваем каждую строку в пределах её длины
+            positions = lengths[group, None] - 1 - np.arange(group_ways.shape[1])
+            rows, columns = np.nonzero(positions >= 0)
+            ways[group[rows], columns] = group_ways[rows, positions[rows, columns]]
+        return ways
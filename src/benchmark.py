@@ -0,0 +1,242 @@
+"""
+Замеры производительности представлений графа и обходов
+
+Графы строятся воспроизводимо (генераторы с зерном) четырёх видов — разреженный случайный,
+плотный, решётка и степенной — нужного числа дуг. Для каждого представления замеряются
+построение из таблицы рёбер, connections(), weight() и BFS/DFS.finding_way: лучшее время из
+нескольких повторов, пропускная способность (операций в секунду) и пиковая память (tracemalloc,
+отдельным прогоном, чтобы трассировка не искажала время). Результаты сохраняются в JSON;
+compare() сравнивает два таких файла и находит замедления.
+
+    python benchmark.py --sizes 100 10000 --output results.json
+    python benchmark.py --sizes 100 10000 --compare baseline.json
+"""
+import sys
+import json
+import time
+import platform
+import argparse
+import subprocess
+import tracemalloc
+import numpy as np
+from bfs import BFS
+from dfs import DFS
+from conversion import convert
+from type_presentation import AdjacencyMatrix, IncidenceMatrix, AdjacencyList, EdgeList, CompressedSparseRow
+
+
+def sparse_graph(edges, rng):
+    """Случайный ориентированный граф со средней степенью 4."""
+    nodes = max(2, edges // 4)
+    return nodes, rng.integers(0, nodes, edges), rng.integers(0, nodes, edges)
+
+
+def dense_graph(edges, rng):
+    """Случайный граф, в котором присутствует около половины всех возможных дуг."""
+    nodes = max(2, int(np.sqrt(2 * edges)))
+    cells = rng.choice(nodes * nodes, size=min(edges, nodes * nodes), replace=False)
+    return nodes, cells // nodes, cells % nodes
+
+
+def grid_graph(edges, rng):
+    """Квадратная решётка, у каждой вершины дуги к соседям по четырём направлениям."""
+    side = max(2, int(np.sqrt(edges / 4)))
+    index = np.arange(side * side).reshape(side, side)
+    horizontal = np.stack((index[:, :-1].ravel(), index[:, 1:].ravel()))
+    vertical = np.stack((index[:-1].ravel(), index[1:].ravel()))
+    sources, targets = np.hstack((horizontal, vertical, horizontal[::-1], vertical[::-1]))
+    return side * side, sources, targets
+
+
+def power_law_graph(edges, rng):
+    """Граф со степенным распределением входящих степеней (вероятность приёмника ~ 1 / ранг)."""
+    nodes = max(2, edges // 4)
+    probabilities = 1.0 / np.arange(1, nodes + 1)
+    targets = rng.choice(nodes, size=edges, p=probabilities / probabilities.sum())
+    return nodes, rng.integers(0, nodes, edges), rng.permutation(nodes)[targets]
+
+
+GENERATORS = {
+    "sparse": sparse_graph,
+    "dense": dense_graph,
+    "grid": grid_graph,
+    "power_law": power_law_graph,
+}
+
+PRESENTATIONS = {
+    "adjacency_matrix": AdjacencyMatrix,
+    "incidence_matrix": IncidenceMatrix,
+    "adjacency_list": AdjacencyList,
+    "edge_list": EdgeList,
+    "csr": CompressedSparseRow,
+}
+
+
+def generate(kind, edges, seed=0) -> EdgeList:
+    """Таблица рёбер графа kind примерно из edges дуг без петель и повторов, веса 1..9."""
+    rng = np.random.default_rng(seed)
+    nodes, sources, targets = GENERATORS[kind](edges, rng)
+    # последняя вершина должна попасть в таблицу, иначе число вершин у представлений разойдётся;
+    # её дуга добавляется до удаления повторов, чтобы не продублировать уже выбранную
+    sources = np.append(sources, nodes - 1)
+    targets = np.append(targets, 0)
+    keys = np.unique(sources.astype(np.int64) * nodes + targets)
+    sources, targets = keys // nodes, keys % nodes
+    keep = sources != targets
+    sources, targets = sources[keep], targets[keep]
+    weights = rng.integers(1, 10, len(sources))
+    return EdgeList(np.column_stack((sources, targets, weights)), indexed=False)
+
+
+def _memory_estimate(presentation, nodes, edges) -> int:
+    # матрицы хранятся плотно, остальные представления — O(V + E)
+    if presentation is AdjacencyMatrix:
+        return nodes * nodes * 8
+    if presentation is IncidenceMatrix:
+        return nodes * edges * 8
+    return (nodes + edges) * 64
+
+
+def _measure(function, repeat):
+    """Лучшее время из repeat запусков и пиковая память отдельного запуска под tracemalloc."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    del result
+    tracemalloc.start()
+    try:
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+
+def _build(table, presentation):
+    if presentation is EdgeList:
+        return EdgeList(table.matrix)
+    return convert(table, presentation)
+
+
+def run(graphs=tuple(GENERATORS), sizes=(100, 1000, 10000), presentations=tuple(PRESENTATIONS),
+        samples=1000, queries=10, repeat=3, seed=0, max_bytes=2**30, log=None) -> dict:
+    """
+    Прогоняет замеры и возвращает словарь для JSON: meta (окружение и параметры) и results —
+    по записи на (граф, размер, представление, операция). Сочетания, у которых плотное
+    представление заняло бы больше max_bytes, записываются с skipped=True.
+    """
+    results = []
+    for kind in graphs:
+        for edges in sizes:
+            table = generate(kind, edges, seed)
+            nodes = int(table.matrix[:, :2].max()) + 1
+            rng = np.random.default_rng(seed)
+            sample_nodes = rng.integers(0, nodes, samples).tolist()
+            sample_arcs = table.matrix[rng.integers(0, len(table), samples), :2].tolist()
+            sample_queries = rng.integers(0, nodes, (queries, 2)).tolist()
+
+            for name in presentations:
+                presentation = PRESENTATIONS[name]
+                record = dict(graph=kind, edges=len(table), nodes=nodes, presentation=name)
+                if _memory_estimate(presentation, nodes, len(table)) > max_bytes:
+                    results.append(dict(record, operation="construction", skipped=True))
+                    continue
+
+                data = _build(table, presentation)
+                bfs, dfs = BFS(data), DFS(data)
+                operations = {
+                    "construction": (lambda: _build(table, presentation), 1),
+                    "connections": (lambda: [data.connections(index) for index in sample_nodes], samples),
+                    "weight": (lambda: [data.weight(i, j) for i, j in sample_arcs], samples),
+                    "bfs": (lambda: [bfs.finding_way(query) for query in sample_queries], queries),
+                    "dfs": (lambda: [dfs.finding_way(query) for query in sample_queries], queries),
+                }
+                for operation, (function, count) in operations.items():
+                    seconds, peak = _measure(function, repeat)
+                    results.append(dict(record, operation=operation, seconds=seconds, operations=count,
+                                        throughput=count / seconds if seconds > 0 else float("inf"),
+                                        peak_bytes=peak))
+                    if log is not None:
+                        log(_format(results[-1]))
+    meta = dict(commit=_commit(), python=platform.python_version(), numpy=np.__version__,
+                platform=platform.platform(), timestamp=time.strftime("%Y-%m-%dT%H:%M:%S"),
+                seed=seed, samples=samples, queries=queries, repeat=repeat)
+    return dict(meta=meta, results=results)
+
+
+def compare(baseline, current, threshold=0.1) -> list:
+    """
+    Записи, которые стали медленнее более чем на долю threshold: список словарей с ключом
+    записи, прежним и новым временем и отношением. Сравниваются только записи, есть в обоих прогонах.
+    """
+    def key(record):
+        return record["graph"], record["edges"], record["presentation"], record["operation"]
+
+    previous = {key(record): record for record in baseline["results"] if not record.get("skipped")}
+    regressions = []
+    for record in current["results"]:
+        old = previous.get(key(record))
+        if old is None or record.get("skipped"):
+            continue
+        ratio = record["seconds"] / old["seconds"] if old["seconds"] > 0 else float("inf")
+        if ratio > 1 + threshold:
+            regressions.append(dict(zip(("graph", "edges", "presentation", "operation"), key(record)),
+                                    before=old["seconds"], after=record["seconds"], ratio=ratio))
+    return regressions
+
+
+def save(report, path):
+    with open(path, "w") as file:
+        json.dump(report, file, indent=1)
+
+
+def load(path) -> dict:
+    with open(path) as file:
+        return json.load(file)
+
+
+def _commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _format(record) -> str:
+    return (f"{record['graph']:>9} {record['edges']:>8} {record['presentation']:>16} {record['operation']:>12} "
+            f"{record['seconds']:10.6f} s {record['throughput']:12.1f} op/s {record['peak_bytes'] / 2**20:9.2f} MiB")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Замеры производительности представлений графа и обходов")
+    parser.add_argument("--graphs", nargs="+", default=list(GENERATORS), choices=list(GENERATORS))
+    parser.add_argument("--sizes", nargs="+", type=int, default=[100, 1000, 10000, 100000, 1000000])
+    parser.add_argument("--presentations", nargs="+", default=list(PRESENTATIONS), choices=list(PRESENTATIONS))
+    parser.add_argument("--samples", type=int, default=1000)
+    parser.add_argument("--queries", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-bytes", type=int, default=2**30)
+    parser.add_argument("--output")
+    parser.add_argument("--compare", help="JSON прежнего прогона; при замедлениях код возврата 1")
+    parser.add_argument("--threshold", type=float, default=0.1)
+    args = parser.parse_args(argv)
+
+    report = run(args.graphs, args.sizes, args.presentations, args.samples, args.queries, args.repeat,
+                 args.seed, args.max_bytes, log=print)
+    if args.output:
+        save(report, args.output)
+    if args.compare:
+        regressions = compare(load(args.compare), report, args.threshold)
+        for record in regressions:
+            print(f"slower: {record['graph']} {record['edges']} {record['presentation']} {record['operation']} "
+                  f"{record['before']:.6f} s -> {record['after']:.6f} s (x{record['ratio']:.2f})")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,20 @@
 import numpy as np
 from queue import Queue
-from type_presentation import AdjacencyMatrix, IncidenceMatrix, AdjacencyList, EdgeList
+from collections import deque
+from search_tree import SearchTree, TraceRecorder
+from conversion import to_csr
+from instrumentation import phase
+from type_presentation import AdjacencyMatrix, IncidenceMatrix, AdjacencyList, EdgeList, CompressedSparseRow
 
 
 class BFS():
-    def __init__(self, data):
+    def __init__(self, data, components=None, instrumentation=None):
         self.data = data
+        self.components = components
+        self.instrumentation = instrumentation
+        self.trace = None
+        self._forward = None
+        self._reverse = None
 
     @property
     def data(self) -> AdjacencyMatrix:
@@ -16,7 +25,7 @@ class BFS():
             self.__data = data
     
     def _check_type(self, data):
-        if not isinstance(data, (AdjacencyMatrix, IncidenceMatrix, AdjacencyList, EdgeList)):
+        if not isinstance(data, (AdjacencyMatrix, IncidenceMatrix, AdjacencyList, EdgeList, CompressedSparseRow)):
             raise TypeError(f"Type {data}: not correct")
 
     def _need_elements(self, index):
@@ -25,39 +34,259 @@ class BFS():
             # в матрице смежности у текущего узла возращаем все соединенные графы
             return np.nonzero(self.data[index])[0]
         elif isinstance(self.data, IncidenceMatrix):
-            # в матрица инцидентности сначала находим все исходящие ребра, потом находим все индексы куда входят эти ребра
-            filtered_indices = np.where((self.data[index] != 0) & (self.data[index] != -1))[0]
-            rows_with_non_zero = np.where((self.data[:, filtered_indices] != 0))[0]
-            return rows_with_non_zero
+            # в матрице инцидентности концы рёбер разложены заранее, берём готовых соседей
+            return self.data.connections(index)
         elif isinstance(self.data, AdjacencyList):
             # в списке смежности уже и так даны соседи, просто возращаем их 
             return self.data[index]
         elif isinstance(self.data, EdgeList):
-            # в списке ребер возрашаем все строки с текущим индексом потом возрашаем все соендинные вершины
-            indexes = np.where(self.data[:, 0] == index)[0]
-            return self.data[indexes, 1]
+            # в списке ребер соседи берутся из индекса по источнику
+            return self.data.connections(index)
+        elif isinstance(self.data, CompressedSparseRow):
+            # в CSR соседи уже лежат подряд, возращаем срез без копирования
+            return self.data.connections(index)
         else:
             raise TypeError(f"invalid data type ({type(self.data)})")
 
-    def finding_way(self, vertices:tuple, data=None) -> list:
+    def _may_reach(self, start, end) -> bool:
+        # вершины из разных слабых компонент не соединены никаким путём, обход не нужен
+        return (self.components is None or self.components.data is not self.data
+                or start == end or self.components.connected(start, end))
+
+    def finding_way(self, vertices:tuple, data=None, mode="visited", record=False) -> list:
+        """
+        Кратчайший по числу переходов путь из start в end.
+
+        mode="visited" — обход с массивом посещённых вершин и массивом родителей, O(V + E).
+        mode="bidirectional" — встречный поиск из start и end (см. bidirectional_way).
+        mode="frontier" — обход по уровням, весь фронт раскрывается операциями NumPy (см. frontier_tree).
+        mode="paths" — прежний обход, хранящий в очереди полный путь до каждой вершины.
+        Если задан components (Components того же графа), запрос между разными слабыми
+        компонентами сразу возвращает None.
+        Если задан instrumentation (Instrumentation), обход копит в нём счётчики и время фаз.
+        record=True (только для mode="visited") — шаги обхода записываются в self.trace (SearchTrace).
+        """
         if data is not None:
             self.data = data
+        if record and mode != "visited":
+            raise ValueError(f"recording is not supported in mode ({mode})")
+        start, end = vertices
+        if not self._may_reach(start, end):
+            return None
+        if mode in ("visited", "frontier"):
+            if mode == "visited":
+                tree = self.search_tree(start, end, record=record)
+                if record:
+                    self.trace = tree.trace
+            else:
+                tree = self.frontier_tree(start, end)
+            with phase(self.instrumentation, "path"):
+                return tree.way(end)
+        elif mode == "bidirectional":
+            return self.bidirectional_way(vertices)
+        elif mode == "paths":
+            return self._paths_way(start, end)
+        raise ValueError(f"invalid mode ({mode})")
+
+    def _paths_way(self, start, end) -> list:
+        probe = self.instrumentation
+        with phase(probe, "setup"):
+            ways = Queue()
+            ways.put((start, [start]))
+            found = None
+        with phase(probe, "search"):
+            while not ways.empty():
+                index, way = ways.get()
+                if index == end:
+                    found = way
+                    break
+
+                need_indexes = self._need_elements(index)
+                if probe is not None:
+                    probe.expand(index, need_indexes, ways.qsize() + 1)
+                for new_index in need_indexes:
+                    # костыль для AdjacencyList
+                    if isinstance(new_index, tuple):
+                        new_index, _ = new_index
+                    if new_index not in way:
+                        ways.put((new_index, way + [new_index]))
+        # путь уже собран в очереди, фаза "path" пустая, но есть у всех режимов
+        with phase(probe, "path"):
+            return found
+
+    def search_tree(self, start, end=None, record=False) -> SearchTree:
+        """
+        Обход в ширину из start с массивом посещённых вершин и массивом родителей.
+
+        Каждая вершина попадает в очередь один раз, поэтому время и память O(V + E).
+        Если задана end, обход останавливается, как только она найдена.
+        При record=True в tree.trace записывается порядок снятия вершин с очереди.
+        """
+        probe = self.instrumentation
+        with phase(probe, "setup"):
+            num_nodes = self.data.number_of_nodes()
+            visited = np.zeros(num_nodes, dtype=bool)
+            parents = np.full(num_nodes, -1, dtype=np.int64)
+            distances = np.full(num_nodes, -1, dtype=np.int64)
+            visited[start] = True
+            distances[start] = 0
+            if record:
+                recorder = TraceRecorder()
+                steps = np.full(num_nodes, -1, dtype=np.int64)
+
+        with phase(probe, "search"):
+            frontier = deque([start])
+            while frontier and not (end is not None and visited[end]):
+                index = frontier.popleft()
+                if record:
+                    steps[index] = recorder.step(index, -1 if index == start else steps[parents[index]])
+                need_indexes = np.asarray(self.data.connections(index), dtype=np.int64)
+                if probe is not None:
+                    probe.expand(index, need_indexes, len(frontier) + 1)
+                new_indexes = need_indexes[~visited[need_indexes]]
+                if len(new_indexes) > 1:
+                    # убираем повторы (кратные рёбра), сохраняя порядок соседей
+                    _, first = np.unique(new_indexes, return_index=True)
+                    new_indexes = new_indexes[np.sort(first)]
+                visited[new_indexes] = True
+                parents[new_indexes] = index
+                distances[new_indexes] = distances[index] + 1
+                frontier.extend(new_indexes.tolist())
+            if record and end is not None and visited[end] and steps[end] == -1:
+                # конечная вершина найдена при раскрытии соседа, записываем её последним шагом
+                recorder.step(end, steps[parents[end]])
+        return SearchTree(start, parents, distances, recorder.trace() if record else None)
+
+    def bidirectional_way(self, vertices:tuple) -> list:
+        """
+        Кратчайший по числу переходов путь встречным поиском.
+
+        Обход ведётся по уровням одновременно из start по исходящим дугам и из end по входящим,
+        каждый раз раскрывается меньший фронт. Поиск заканчивается на уровне, где фронты встретились;
+        из найденных на нём точек встречи берётся дающая самый короткий путь.
+        """
         start, end = vertices
-        ways = Queue()
-        ways.put((start, [start]))
-        while not ways.empty():
-            index, way = ways.get()
-            if index == end:
-                return way
-
-            need_indexes = self._need_elements(index)
-            for new_index in need_indexes:
-                # костыль для AdjacencyList
-                if isinstance(new_index, tuple):
-                    new_index, _ = new_index
-                if new_index not in way:
-                    ways.put((new_index, way + [new_index]))
-        return None
+        if start == end:
+            return [start]
+
+        probe = self.instrumentation
+        with phase(probe, "setup"):
+            num_nodes = self.data.number_of_nodes()
+            sides = []
+            for root, neighbors in ((start, self.data.connections), (end, self._reverse_connections())):
+                distances = np.full(num_nodes, -1, dtype=np.int64)
+                parents = np.full(num_nodes, -1, dtype=np.int64)
+                distances[root] = 0
+                sides.append((np.array([root], dtype=np.int64), distances, parents, neighbors))
+
+        meeting = None
+        with phase(probe, "search"):
+            while meeting is None and len(sides[0][0]) and len(sides[1][0]):
+                expanded = 0 if len(sides[0][0]) <= len(sides[1][0]) else 1
+                frontier, distances, parents, neighbors = sides[expanded]
+                other_distances = sides[1 - expanded][1]
+
+                next_frontier = []
+                for index in frontier.tolist():
+                    need_indexes = np.asarray(neighbors(index), dtype=np.int64)
+                    if probe is not None:
+                        probe.expand(index, need_indexes, len(sides[0][0]) + len(sides[1][0]))
+                    new_indexes = need_indexes[distances[need_indexes] == -1]
+                    distances[new_indexes] = distances[index] + 1
+                    parents[new_indexes] = index
+                    next_frontier.append(new_indexes)
+                frontier = np.concatenate(next_frontier) if next_frontier else frontier[:0]
+                sides[expanded] = (frontier, distances, parents, neighbors)
+
+                meetings = frontier[other_distances[frontier] != -1]
+                if len(meetings):
+                    meeting = int(meetings[np.argmin(other_distances[meetings])])
+        if meeting is None:
+            return None
+        with phase(probe, "path"):
+            return self._join_ways(meeting, sides[0][2], sides[1][2])
+
+    @staticmethod
+    def _join_ways(meeting, forward_parents, backward_parents) -> list:
+        way = [meeting]
+        while forward_parents[way[-1]] != -1:
+            way.append(int(forward_parents[way[-1]]))
+        way.reverse()
+        while backward_parents[way[-1]] != -1:
+            way.append(int(backward_parents[way[-1]]))
+        return way
+
+    def _reverse_connections(self):
+        """Функция входящих соседей; для всех представлений, кроме матрицы смежности, один раз строится обратный CSR."""
+        if isinstance(self.data, AdjacencyMatrix):
+            return lambda index: np.nonzero(self.data.matrix[:, index])[0]
+        if self._reverse is None or self._reverse[0] is not self.data or self._reverse[1] != self.data.version:
+            self._reverse = (self.data, self.data.version, self._forward_csr().transpose())
+        return self._reverse[2].connections
+
+    def _forward_csr(self) -> CompressedSparseRow:
+        """CSR графа для обхода по уровням; строится один раз и хранится до изменения графа (Graph.version)."""
+        if self._forward is None or self._forward[0] is not self.data or self._forward[1] != self.data.version:
+            self._forward = (self.data, self.data.version, to_csr(self.data))
+        return self._forward[2]
+
+    def frontier_tree(self, start, end=None) -> SearchTree:
+        """
+        Обход в ширину по уровням: на каждом шаге раскрывается весь фронт сразу.
+
+        Для матрицы смежности следующий фронт — строки текущего фронта, объединённые по столбцам
+        и очищенные от посещённых вершин; остальные представления приводятся к CSR (один раз до изменения
+        графа), и соседи всего фронта собираются одной выборкой. Внутренний цикл идёт по уровням, а не по вершинам.
+        Возвращает дерево с расстояниями (числом переходов) до всех достижимых вершин.
+        """
+        probe = self.instrumentation
+        with phase(probe, "setup"):
+            num_nodes = self.data.number_of_nodes()
+            visited = np.zeros(num_nodes, dtype=bool)
+            parents = np.full(num_nodes, -1, dtype=np.int64)
+            distances = np.full(num_nodes, -1, dtype=np.int64)
+            visited[start] = True
+            distances[start] = 0
+
+            if isinstance(self.data, AdjacencyMatrix):
+                expand = self._expand_matrix_frontier
+                degrees = lambda frontier: np.count_nonzero(self.data.matrix[frontier])
+            else:
+                csr = self._forward_csr()
+                expand = lambda frontier, visited: self._expand_csr_frontier(csr, frontier, visited)
+                degrees = lambda frontier: int((csr.indptr[frontier + 1] - csr.indptr[frontier]).sum())
+
+        with phase(probe, "search"):
+            frontier = np.array([start], dtype=np.int64)
+            level = 0
+            while len(frontier) and not (end is not None and visited[end]):
+                level += 1
+                expanded = frontier
+                frontier, frontier_parents = expand(frontier, visited)
+                visited[frontier] = True
+                parents[frontier] = frontier_parents
+                distances[frontier] = level
+                if probe is not None:
+                    probe.expand_level(level, frontier, len(expanded), degrees(expanded))
+        return SearchTree(start, parents, distances)
+
+    def _expand_matrix_frontier(self, frontier, visited):
+        rows = self.data.matrix[frontier] != 0
+        new_indexes = np.nonzero(rows.any(axis=0) & ~visited)[0]
+        # родитель — первая вершина фронта, из которой есть ребро
+        return new_indexes, frontier[rows[:, new_indexes].argmax(axis=0)]
+
+    @staticmethod
+    def _expand_csr_frontier(csr, frontier, visited):
+        starts = csr.indptr[frontier]
+        counts = csr.indptr[frontier + 1] - starts
+        # позиции всех соседей фронта в indices одним массивом
+        positions = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+        need_indexes = csr.indices[positions]
+        owners = np.repeat(frontier, counts)
+        fresh = ~visited[need_indexes]
+        new_indexes, first = np.unique(need_indexes[fresh], return_index=True)
+        return new_indexes.astype(np.int64), owners[fresh][first]
 
 
 if __name__ == "__main__":
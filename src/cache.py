@@ -0,0 +1,67 @@
+from collections import OrderedDict
+
+
+class CachedSearch():
+    """
+    LRU-кэш деревьев поиска
+
+    Оборачивает движок (BFS, DFS, Dijkstra и т. п.) и хранит полные деревья поиска (родители и расстояния)
+    для недавно запрошенных начальных вершин. Любой запрос пути из закэшированной вершины
+    отвечается без обхода. Размер ограничен числом деревьев maxsize и, по желанию, их суммарным
+    объёмом max_bytes; вытесняются давно не использованные деревья.
+    Кэш сбрасывается сам, если графу подменили объект или у графа изменилась версия (Graph.version).
+    Изменения массивов графа на месте версию не меняют — после них нужно вызвать clear().
+    """
+    def __init__(self, engine, maxsize=128, max_bytes=None):
+        self.engine = engine
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._trees = OrderedDict()
+        self._bytes = 0
+        self._source = None
+        self._version = None
+
+    @property
+    def data(self):
+        return self.engine.data
+
+    def finding_way(self, vertices:tuple, data=None) -> list:
+        if data is not None:
+            self.engine.data = data
+        start, end = vertices
+        return self.search_tree(start).way(end)
+
+    def search_tree(self, start):
+        self._check_version()
+        tree = self._trees.get(start)
+        if tree is not None:
+            self.hits += 1
+            self._trees.move_to_end(start)
+            return tree
+
+        self.misses += 1
+        tree = self.engine.search_tree(start)
+        self._trees[start] = tree
+        self._bytes += self._tree_bytes(tree)
+        while len(self._trees) > self.maxsize or (
+                self.max_bytes is not None and self._bytes > self.max_bytes and len(self._trees) > 1):
+            _, evicted = self._trees.popitem(last=False)
+            self._bytes -= self._tree_bytes(evicted)
+        return tree
+
+    def clear(self):
+        self._trees.clear()
+        self._bytes = 0
+
+    def _check_version(self):
+        data = self.engine.data
+        if self._source is not data or self._version != data.version:
+            self.clear()
+            self._source = data
+            self._version = data.version
+
+    @staticmethod
+    def _tree_bytes(tree) -> int:
+        return tree.parents.nbytes + tree.distances.nbytes
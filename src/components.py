@@ -0,0 +1,234 @@
+import numpy as np
+from conversion import to_csr
+
+
+class DisjointSet():
+    """
+    Система непересекающихся множеств (union-find)
+
+    Родители хранятся в плоском массиве (списке Python — поэлементный доступ к нему быстрее,
+    чем к массиву NumPy), поиск корня сжимает путь, объединение идёт по рангу.
+    Обе операции работают за почти константное амортизированное время.
+    """
+    def __init__(self, size):
+        self.parent = list(range(size))
+        self.rank = [0] * size
+
+    def __len__(self):
+        return len(self.parent)
+
+    def find(self, index) -> int:
+        parent = self.parent
+        root = index
+        while parent[root] != root:
+            root = parent[root]
+        while parent[index] != root:
+            parent[index], index = root, parent[index]
+        return root
+
+    def union(self, i, j) -> bool:
+        """Объединяет множества i и j; False, если они уже были одним множеством."""
+        i, j = self.find(i), self.find(j)
+        if i == j:
+            return False
+        if self.rank[i] < self.rank[j]:
+            i, j = j, i
+        self.parent[j] = i
+        if self.rank[i] == self.rank[j]:
+            self.rank[i] += 1
+        return True
+
+    def union_edges(self, sources, targets):
+        union = self.union
+        for i, j in zip(np.asarray(sources).tolist(), np.asarray(targets).tolist()):
+            union(i, j)
+
+    def labels(self) -> np.ndarray:
+        """Номер множества каждого элемента; множества пронумерованы 0, 1, ... по наименьшему элементу."""
+        return _renumber([self.find(index) for index in range(len(self))])
+
+
+def weak_components(data) -> np.ndarray:
+    """Метки слабых компонент связности (направления дуг не учитываются) через union-find."""
+    csr = to_csr(data)
+    sources = np.repeat(np.arange(len(csr)), np.diff(csr.indptr))
+    components = DisjointSet(len(csr))
+    components.union_edges(sources, csr.indices)
+    return components.labels()
+
+
+def strong_components(data, method="tarjan") -> np.ndarray:
+    """
+    Метки компонент сильной связности.
+
+    method="tarjan" — один обход в глубину с low-link значениями.
+    method="kosaraju" — обход графа для порядка выхода и обход обратного графа в обратном порядке.
+    Оба обхода идут по явному стеку, поэтому глубина графа не упирается в предел рекурсии Python.
+    Компоненты пронумерованы 0, 1, ... по наименьшей вершине.
+    """
+    csr = to_csr(data)
+    if method == "tarjan":
+        labels = _tarjan(csr.indptr.tolist(), csr.indices.tolist())
+    elif method == "kosaraju":
+        reverse = csr.transpose()
+        labels = _kosaraju(csr.indptr.tolist(), csr.indices.tolist(),
+                           reverse.indptr.tolist(), reverse.indices.tolist())
+    else:
+        raise ValueError(f"invalid method ({method})")
+    return _renumber(labels)
+
+
+def _renumber(labels) -> np.ndarray:
+    """Перенумеровывает произвольные метки в 0, 1, ... по порядку первой вершины с каждой меткой."""
+    _, first, labels = np.unique(np.asarray(labels, dtype=np.int64), return_index=True, return_inverse=True)
+    order = np.empty(len(first), dtype=np.int64)
+    order[np.argsort(first)] = np.arange(len(first))
+    return order[labels.ravel()]
+
+
+def _tarjan(indptr, indices) -> list:
+    num_nodes = len(indptr) - 1
+    order = [-1] * num_nodes
+    low = [0] * num_nodes
+    on_stack = [False] * num_nodes
+    labels = [-1] * num_nodes
+    component_stack = []
+    counter = 0
+    count = 0
+
+    for root in range(num_nodes):
+        if order[root] != -1:
+            continue
+        # в стеке обхода лежат пары (вершина, позиция следующего соседа в indices)
+        order[root] = low[root] = counter
+        counter += 1
+        component_stack.append(root)
+        on_stack[root] = True
+        stack = [(root, indptr[root])]
+        while stack:
+            index, position = stack[-1]
+            if position < indptr[index + 1]:
+                stack[-1] = (index, position + 1)
+                new_index = indices[position]
+                if order[new_index] == -1:
+                    order[new_index] = low[new_index] = counter
+                    counter += 1
+                    component_stack.append(new_index)
+                    on_stack[new_index] = True
+                    stack.append((new_index, indptr[new_index]))
+                elif on_stack[new_index] and order[new_index] < low[index]:
+                    low[index] = order[new_index]
+                continue
+
+            stack.pop()
+            if stack and low[index] < low[stack[-1][0]]:
+                low[stack[-1][0]] = low[index]
+            if low[index] == order[index]:
+                while True:
+                    member = component_stack.pop()
+                    on_stack[member] = False
+                    labels[member] = count
+                    if member == index:
+                        break
+                count += 1
+    return labels
+
+
+def _kosaraju(indptr, indices, reverse_indptr, reverse_indices) -> list:
+    num_nodes = len(indptr) - 1
+    visited = [False] * num_nodes
+    finished = []
+    for root in range(num_nodes):
+        if visited[root]:
+            continue
+        visited[root] = True
+        stack = [(root, indptr[root])]
+        while stack:
+            index, position = stack[-1]
+            if position < indptr[index + 1]:
+                stack[-1] = (index, position + 1)
+                new_index = indices[position]
+                if not visited[new_index]:
+                    visited[new_index] = True
+                    stack.append((new_index, indptr[new_index]))
+            else:
+                stack.pop()
+                finished.append(index)
+
+    labels = [-1] * num_nodes
+    count = 0
+    for root in reversed(finished):
+        if labels[root] != -1:
+            continue
+        labels[root] = count
+        stack = [root]
+        while stack:
+            index = stack.pop()
+            for position in range(reverse_indptr[index], reverse_indptr[index + 1]):
+                new_index = reverse_indices[position]
+                if labels[new_index] == -1:
+                    labels[new_index] = count
+                    stack.append(new_index)
+        count += 1
+    return labels
+
+
+class Components():
+    """
+    Компоненты связности графа
+
+    Метки слабых и сильных компонент считаются при первом обращении и хранятся до изменения
+    графа (Graph.version). По ним за O(1) отсекаются запросы пути между вершинами разных
+    слабых компонент — такой путь не существует ни в каком направлении; BFS и DFS принимают
+    объект Components и отвечают на такие запросы None без обхода.
+    Изменения массивов графа на месте версию не меняют — после них нужно вызвать clear().
+    """
+    def __init__(self, data, method="tarjan"):
+        self.data = data
+        self.method = method
+        self._weak = None
+        self._strong = None
+        self._version = None
+
+    @property
+    def weak(self) -> np.ndarray:
+        self._check_version()
+        if self._weak is None:
+            self._weak = weak_components(self.data)
+        return self._weak
+
+    @property
+    def strong(self) -> np.ndarray:
+        self._check_version()
+        if self._strong is None:
+            self._strong = strong_components(self.data, self.method)
+        return self._strong
+
+    def number_of_components(self, strong=False) -> int:
+        labels = self.strong if strong else self.weak
+        return int(labels.max(initial=-1)) + 1
+
+    def groups(self, strong=False) -> list:
+        """Вершины каждой компоненты (массив на компоненту), например, для разбиения графа на части."""
+        labels = self.strong if strong else self.weak
+        order = np.argsort(labels, kind="stable")
+        return np.split(order, np.cumsum(np.bincount(labels))[:-1])
+
+    def connected(self, start, end) -> bool:
+        """Лежат ли вершины в одной слабой компоненте (необходимое условие существования пути)."""
+        weak = self.weak
+        return 0 <= start < len(weak) and 0 <= end < len(weak) and weak[start] == weak[end]
+
+    def strongly_connected(self, start, end) -> bool:
+        """Достижимы ли вершины друг из друга."""
+        strong = self.strong
+        return 0 <= start < len(strong) and 0 <= end < len(strong) and strong[start] == strong[end]
+
+    def clear(self):
+        self._weak = None
+        self._strong = None
+
+    def _check_version(self):
+        if self._version != self.data.version:
+            self.clear()
+            self._version = self.data.version
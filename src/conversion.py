@@ -0,0 +1,127 @@
+import numpy as np
+from itertools import chain
+from type_presentation import (AdjacencyMatrix, IncidenceMatrix, AdjacencyList, EdgeList, CompressedSparseRow,
+                               _incidence_arcs)
+
+
+def arcs(data):
+    """
+    Раскладывает любое представление графа на параллельные массивы дуг.
+
+    Возвращает (число вершин, источники, приёмники, веса). Все представления приводятся к этому
+    виду одним векторизованным проходом, без вызовов connections()/weight() для каждой вершины.
+    """
+    if isinstance(data, AdjacencyMatrix):
+        sources, targets = np.nonzero(data.matrix)
+        return data.number_of_nodes(), sources, targets, data.matrix[sources, targets]
+    elif isinstance(data, IncidenceMatrix):
+        sources, targets, weights, _ = _incidence_arcs(data.matrix)
+        return data.number_of_nodes(), sources, targets, weights
+    elif isinstance(data, AdjacencyList) and data.compact:
+        return arcs(data._compact)
+    elif isinstance(data, AdjacencyList):
+        lengths = np.fromiter((len(neighbors) for neighbors in data.data), dtype=np.int64, count=len(data.data))
+        pairs = np.array(list(chain.from_iterable(data.data))).reshape(-1, 2)
+        sources = np.repeat(np.arange(len(lengths)), lengths)
+        return data.number_of_nodes(), sources, pairs[:, 0].astype(np.int64), pairs[:, 1]
+    elif isinstance(data, EdgeList):
+        matrix = np.asarray(data.matrix)
+        return (data.number_of_nodes(), matrix[:, 0].astype(np.int64), matrix[:, 1].astype(np.int64),
+                matrix[:, 2])
+    elif isinstance(data, CompressedSparseRow):
+        data.flush()
+        sources = np.repeat(np.arange(len(data)), np.diff(data.indptr))
+        return len(data), sources, data.indices.astype(np.int64), data.weights
+    else:
+        raise TypeError(f"invalid data type ({type(data)})")
+
+
+def is_symmetric(data) -> bool:
+    """Проверяет, что каждой дуге (i, j, w) соответствует обратная дуга (j, i, w) — граф неориентированный."""
+    num_nodes, sources, targets, weights = arcs(data)
+    forward = np.lexsort((weights, targets, sources))
+    backward = np.lexsort((weights, sources, targets))
+    return (np.array_equal(sources[forward], targets[backward])
+            and np.array_equal(targets[forward], sources[backward])
+            and np.array_equal(weights[forward], weights[backward]))
+
+
+def to_adjacency_matrix(data) -> AdjacencyMatrix:
+    """Матрица смежности. Кратные дуги схлопываются (остаётся последняя), нулевой вес означает отсутствие дуги."""
+    if isinstance(data, AdjacencyMatrix):
+        return data
+    num_nodes, sources, targets, weights = arcs(data)
+    matrix = np.zeros((num_nodes, num_nodes), dtype=weights.dtype)
+    matrix[sources, targets] = weights
+    return AdjacencyMatrix(matrix)
+
+
+def to_incidence_matrix(data, directed=None) -> IncidenceMatrix:
+    """
+    Матрица инцидентности.
+
+    При directed=True каждая дуга становится столбцом (вес у источника, -1 у приёмника).
+    При directed=False пара встречных дуг становится одним столбцом с весом у обоих концов.
+    По умолчанию граф считается неориентированным, если он симметричен.
+    """
+    if isinstance(data, IncidenceMatrix):
+        return data
+    num_nodes, sources, targets, weights = arcs(data)
+    if directed is None:
+        directed = not is_symmetric(data)
+    if not directed:
+        keep = sources <= targets
+        sources, targets, weights = sources[keep], targets[keep], weights[keep]
+
+    columns = np.arange(len(sources))
+    matrix = np.zeros((num_nodes, len(sources)), dtype=np.result_type(weights.dtype, np.int8))
+    matrix[targets, columns] = weights if not directed else -1
+    # вес у источника записываем последним, чтобы петля не затёрлась отметкой входа
+    matrix[sources, columns] = weights
+    return IncidenceMatrix(matrix)
+
+
+def to_adjacency_list(data) -> AdjacencyList:
+    """Список смежности. Порядок соседей внутри вершины сохраняется."""
+    if isinstance(data, AdjacencyList):
+        return data
+    num_nodes, sources, targets, weights = arcs(data)
+    order = np.argsort(sources, kind="stable")
+    offsets = np.zeros(num_nodes + 1, dtype=np.int64)
+    np.cumsum(np.bincount(sources, minlength=num_nodes), out=offsets[1:])
+    flat = list(zip(targets[order].tolist(), weights[order].tolist()))
+    return AdjacencyList([flat[start:end] for start, end in zip(offsets[:-1].tolist(), offsets[1:].tolist())])
+
+
+def to_edge_list(data) -> EdgeList:
+    """Список рёбер. Изолированные вершины с наибольшими номерами в нём не сохраняются."""
+    if isinstance(data, EdgeList):
+        return data
+    _, sources, targets, weights = arcs(data)
+    dtype = np.result_type(sources.dtype, weights.dtype)
+    return EdgeList(np.column_stack((sources.astype(dtype), targets.astype(dtype), weights.astype(dtype))))
+
+
+def to_csr(data) -> CompressedSparseRow:
+    """Сжатое разреженное представление (CSR). Накопленные изменения CSR при этом вливаются в массивы."""
+    if isinstance(data, CompressedSparseRow):
+        data.flush()
+        return data
+    num_nodes, sources, targets, weights = arcs(data)
+    return CompressedSparseRow.from_edges(sources, targets, weights, num_nodes=num_nodes)
+
+
+_CONVERTERS = {
+    AdjacencyMatrix: to_adjacency_matrix,
+    IncidenceMatrix: to_incidence_matrix,
+    AdjacencyList: to_adjacency_list,
+    EdgeList: to_edge_list,
+    CompressedSparseRow: to_csr,
+}
+
+
+def convert(data, presentation, **kwargs):
+    """Переводит граф data в представление presentation (класс из type_presentation)."""
+    if presentation not in _CONVERTERS:
+        raise TypeError(f"invalid presentation ({presentation})")
+    return _CONVERTERS[presentation](data, **kwargs)
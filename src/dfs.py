@@ -1,13 +1,18 @@
 # import time
 import numpy as np
 # from stack import Stack
-from type_presentation import AdjacencyMatrix, IncidenceMatrix, AdjacencyList, EdgeList
+from search_tree import SearchTree, TraceRecorder
+from instrumentation import phase
+from type_presentation import AdjacencyMatrix, IncidenceMatrix, AdjacencyList, EdgeList, CompressedSparseRow
 from visualization import NetworxGraphVisualizer
 
 
 class DFS():
-    def __init__(self, data):
+    def __init__(self, data, components=None, instrumentation=None):
         self.data = data
+        self.components = components
+        self.instrumentation = instrumentation
+        self.trace = None
 
     @property
     def data(self) -> AdjacencyMatrix:
@@ -23,51 +28,142 @@ class DFS():
             # в матрице смежности у текущего узла возращаем все соединенные графы
             return np.nonzero(self.data[index])[0]
         elif isinstance(self.data, IncidenceMatrix):
-            # в матрица инцидентности сначала находим все исходящие ребра, потом находим все индексы куда входят эти ребра
-            filtered_indices = np.where((self.data[index] != 0) & (self.data[index] != -1))[0]
-            rows_with_non_zero = np.where((self.data[:, filtered_indices] != 0))[0]
-            return rows_with_non_zero
+            # в матрице инцидентности концы рёбер разложены заранее, берём готовых соседей
+            return self.data.connections(index)
         elif isinstance(self.data, AdjacencyList):
             # в списке смежности уже и так даны соседи, просто возращаем их 
             return self.data[index]
         elif isinstance(self.data, EdgeList):
-            # в списке ребер возрашаем все строки с текущим индексом потом возрашаем все соендинные вершины
-            indexes = np.where(self.data[:, 0] == index)[0]
-            return self.data[indexes, 1]
+            # в списке ребер соседи берутся из индекса по источнику
+            return self.data.connections(index)
+        elif isinstance(self.data, CompressedSparseRow):
+            # в CSR соседи уже лежат подряд, возращаем срез без копирования
+            return self.data.connections(index)
         else:
             raise TypeError(f"invalid data type ({type(self.data)})")
 
-    def finding_way(self, vertices:tuple, data=None, display=False, time_sleep=None) -> list:
+    def _may_reach(self, start, end) -> bool:
+        # вершины из разных слабых компонент не соединены никаким путём, обход не нужен
+        return (self.components is None or self.components.data is not self.data
+                or start == end or self.components.connected(start, end))
+
+    def finding_way(self, vertices:tuple, data=None, display=False, time_sleep=None, mode="visited",
+                    step_hook=None, record=False) -> list:
+        """
+        Путь из start в end обходом в глубину.
+
+        mode="visited" — обход с массивом посещённых вершин, массивом родителей и стеком номеров, O(V + E).
+        mode="paths" — прежний обход, хранящий в стеке полный путь до каждой вершины.
+        step_hook(index, need_indexes) — необязательный вызов на каждом шаге (например, для логирования),
+        без него обход ничего не печатает.
+        record=True — шаги обхода записываются в self.trace (SearchTrace).
+        display=True — обход идёт с записью на полной скорости, а шаги показываются после него
+        (NetworxGraphVisualizer.replay) с паузой time_sleep между кадрами.
+        Если задан components (Components того же графа), запрос между разными слабыми
+        компонентами сразу возвращает None.
+        Если задан instrumentation (Instrumentation), обход копит в нём счётчики и время фаз.
+        """
         if data is not None:
             self.data = data
+        if not self._may_reach(*vertices):
+            return None
 
+        start, end = vertices
+        record = record or display
+        if mode == "visited":
+            tree = self.search_tree(start, end, step_hook=step_hook, record=record)
+            with phase(self.instrumentation, "path"):
+                way, trace = tree.way(end), tree.trace
+        elif mode == "paths":
+            way, trace = self._paths_way(start, end, step_hook, TraceRecorder() if record else None)
+        else:
+            raise ValueError(f"invalid mode ({mode})")
+
+        if record:
+            self.trace = trace
         if display:
-            graph_display = NetworxGraphVisualizer(data = self.data, plot_sleep=time_sleep)
+            graph_display = NetworxGraphVisualizer(data=self.data, plot_sleep=time_sleep)
             graph_display.draw_graph(layout="circular")
-    
-        start, end = vertices
-        ways = [(start, [start])] # stack
-        print(self.data)
-        while ways:
-            index, way = ways.pop()
-            
-            if display:
-               graph_display.update_graph(way, index)
-
-            if index == end:
-                return way
-            need_indexes = self.data.connections(index)
-
-            for new_index in need_indexes:
-                print(self.data.weight(index, new_index))
-                # костыль для AdjacencyList
-                if isinstance(new_index, tuple):
-                    new_index, _ = new_index
-                if new_index not in way:
-                    ways.append((new_index, way + [new_index]))
-            # print()
-
-        return None
+            graph_display.replay(trace)
+        return way
+
+    def _paths_way(self, start, end, step_hook=None, recorder=None):
+        probe = self.instrumentation
+        with phase(probe, "setup"):
+            ways = [(start, [start], -1)] # stack
+            found = None
+        with phase(probe, "search"):
+            while ways:
+                index, way, parent_step = ways.pop()
+                step = recorder.step(index, parent_step) if recorder is not None else -1
+
+                if index == end:
+                    found = way
+                    break
+                need_indexes = self.data.connections(index)
+                if step_hook is not None:
+                    step_hook(index, need_indexes)
+                if probe is not None:
+                    probe.expand(index, need_indexes, len(ways) + 1)
+
+                for new_index in need_indexes:
+                    # костыль для AdjacencyList
+                    if isinstance(new_index, tuple):
+                        new_index, _ = new_index
+                    if new_index not in way:
+                        ways.append((new_index, way + [new_index], step))
+        # путь уже собран в стеке, фаза "path" пустая, но есть у всех режимов
+        with phase(probe, "path"):
+            return found, recorder.trace() if recorder is not None else None
+
+    def search_tree(self, start, end=None, step_hook=None, record=False) -> SearchTree:
+        """
+        Обход в глубину из start с массивом посещённых вершин и массивом родителей.
+
+        В стеке лежат только номера вершин; вершина помечается посещённой при снятии со стека,
+        а родителем становится последняя положившая её вершина. Время и память O(V + E).
+        distances — глубина вершины в дереве обхода. Если задана end, обход останавливается на ней.
+        При record=True в tree.trace записывается порядок снятия вершин со стека.
+        """
+        probe = self.instrumentation
+        with phase(probe, "setup"):
+            num_nodes = self.data.number_of_nodes()
+            visited = np.zeros(num_nodes, dtype=bool)
+            parents = np.full(num_nodes, -1, dtype=np.int64)
+            distances = np.full(num_nodes, -1, dtype=np.int64)
+            tree = SearchTree(start, parents, distances)
+            if record:
+                recorder = TraceRecorder()
+                steps = np.full(num_nodes, -1, dtype=np.int64)
+
+        with phase(probe, "search"):
+            stack = [start]
+            while stack:
+                index = stack.pop()
+                if visited[index]:
+                    continue
+                visited[index] = True
+                distances[index] = 0 if index == start else distances[parents[index]] + 1
+
+                if record:
+                    steps[index] = recorder.step(index, -1 if index == start else steps[parents[index]])
+                if index == end:
+                    break
+
+                need_indexes = np.asarray(self.data.connections(index), dtype=np.int64)
+                if step_hook is not None:
+                    step_hook(index, need_indexes)
+                if probe is not None:
+                    probe.expand(index, need_indexes, len(stack) + 1)
+                new_indexes = need_indexes[~visited[need_indexes]]
+                parents[new_indexes] = index
+                stack.extend(new_indexes.tolist())
+
+            # вершины, положенные в стек, но так и не снятые, в дерево не входят
+            parents[~visited] = -1
+        if record:
+            tree.trace = recorder.trace()
+        return tree
 
 
 if __name__ == "__main__":
@@ -0,0 +1,90 @@
+import heapq
+import numpy as np
+from search_tree import SearchTree
+from conversion import to_csr
+from type_presentation import EdgeList
+
+
+class Dijkstra():
+    """
+    Алгоритм Дейкстры на двоичной куче
+
+    Веса читаются один раз целиком из родного хранилища представления (значения матрицы смежности,
+    кортежи списка смежности, третий столбец списка рёбер) и складываются в CSR, поэтому weight(i, j)
+    в цикле не вызывается. Веса должны быть неотрицательными.
+    """
+    def __init__(self, data):
+        self.data = data
+        self._csr = None
+
+    def finding_way(self, vertices:tuple, data=None) -> list:
+        """Путь минимального веса из start в end; поиск останавливается, как только end снята с кучи."""
+        if data is not None:
+            self.data = data
+        start, end = vertices
+        return self.search_tree(start, end).way(end)
+
+    def distance(self, vertices:tuple, data=None) -> float:
+        """Вес кратчайшего пути из start в end (inf, если end недостижима)."""
+        if data is not None:
+            self.data = data
+        start, end = vertices
+        return float(self.search_tree(start, end).distances[end])
+
+    def distances(self, start, data=None) -> np.ndarray:
+        """Веса кратчайших путей из start во все вершины (inf для недостижимых)."""
+        if data is not None:
+            self.data = data
+        return self.search_tree(start).distances
+
+    def search_tree(self, start, end=None) -> SearchTree:
+        csr = self._weighted_csr()
+        distances = np.full(len(csr), np.inf)
+        parents = np.full(len(csr), -1, dtype=np.int64)
+        done = np.zeros(len(csr), dtype=bool)
+        distances[start] = 0
+
+        heap = [(0.0, start)]
+        while heap:
+            distance, index = heapq.heappop(heap)
+            if done[index]:
+                continue
+            done[index] = True
+            if index == end:
+                break
+
+            begin, stop = csr.indptr[index], csr.indptr[index + 1]
+            need_indexes = csr.indices[begin:stop]
+            candidates = distance + csr.weights[begin:stop]
+            improved = candidates < distances[need_indexes]
+            if not improved.any():
+                continue
+            need_indexes, candidates = need_indexes[improved], candidates[improved]
+            # minimum.at учитывает кратные рёбра до одной вершины
+            np.minimum.at(distances, need_indexes, candidates)
+            won = distances[need_indexes] == candidates
+            parents[need_indexes[won]] = index
+            for new_distance, new_index in zip(candidates[won].tolist(), need_indexes[won].tolist()):
+                heapq.heappush(heap, (new_distance, new_index))
+        return SearchTree(start, parents, distances)
+
+    def _weighted_csr(self):
+        if self._csr is None or self._csr[0] is not self.data or self._csr[1] != self.data.version:
+            csr = to_csr(self.data)
+            if len(csr.weights) and csr.weights.min() < 0:
+                raise ValueError("Dijkstra requires non-negative weights")
+            self._csr = (self.data, self.data.version, csr)
+        return self._csr[2]
+
+
+if __name__ == "__main__":
+    edges = np.array([
+        [0, 1, 5],  # Ребро между вершинами 0 и 1 с весом 5
+        [0, 2, 10], # Ребро между вершинами 0 и 2 с весом 10
+        [1, 3, 7],  # Ребро между вершинами 1 и 3 с весом 7
+        [2, 3, 3],  # Ребро между вершинами 2 и 3 с весом 3
+        [3, 4, 2]   # Ребро между вершинами 3 и 4 с весом 2
+    ])
+
+    my_class = Dijkstra(EdgeList(edges))
+    print(my_class.finding_way((0, 4)), my_class.distance((0, 4)))
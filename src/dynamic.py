@@ -0,0 +1,182 @@
+import heapq
+import numpy as np
+from collections import deque
+from bfs import BFS
+from conversion import arcs
+from search_tree import SearchTree
+from type_presentation import CompressedSparseRow
+
+
+class DynamicDistances():
+    """
+    Расстояния в переходах от одной вершины, поддерживаемые при изменении графа
+
+    Граф меняется через методы этого объекта (add_node, add_edge, remove_edge и пакетные варианты):
+    они передают изменение графу и тут же чинят дерево кратчайших путей, не запуская BFS заново.
+    - Добавление дуги i -> j уменьшает расстояния только там, куда через неё стало ближе:
+      обход в ширину начинается из j и идёт лишь по улучшившимся вершинам.
+    - Удаление дуги дерева i -> j сначала ищет j другого родителя на том же уровне; если его нет,
+      пересчитывается только поддерево j: его вершины получают расстояния от входящих дуг
+      извне поддерева, затем расстояния распространяются внутри него по возрастанию.
+    Удаление дуги вне дерева ничего не стоит. Для входящих дуг держится обратный CSR,
+    который меняется вместе с графом.
+    Если граф изменили в обход объекта (сменилась Graph.version), всё пересчитывается заново при
+    следующем обращении.
+    """
+    def __init__(self, data, source):
+        self.data = data
+        self.source = source
+        self.refresh()
+
+    @property
+    def distances(self) -> np.ndarray:
+        """Расстояние от source до каждой вершины (-1 для недостижимых)."""
+        self._check_version()
+        return self._distances
+
+    @property
+    def parents(self) -> np.ndarray:
+        self._check_version()
+        return self._parents
+
+    def distance(self, end) -> int:
+        return int(self.distances[end])
+
+    def reachable(self, end) -> bool:
+        return self.distances[end] != -1
+
+    def search_tree(self) -> SearchTree:
+        """Текущее дерево кратчайших путей (массивы не копируются и меняются вместе с графом)."""
+        self._check_version()
+        return SearchTree(self.source, self._parents, self._distances)
+
+    def finding_way(self, end) -> list:
+        return self.search_tree().way(end)
+
+    def refresh(self):
+        """Полный пересчёт: обход в ширину из source и новый обратный CSR."""
+        tree = BFS(self.data).search_tree(self.source)
+        self._parents = tree.parents.copy()
+        self._distances = tree.distances.copy()
+        num_nodes, sources, targets, weights = arcs(self.data)
+        self._reverse = CompressedSparseRow.from_edges(targets, sources, weights,
+                                                       num_nodes=max(num_nodes, len(self._distances)))
+        self._version = self.data.version
+
+    def add_node(self) -> int:
+        self._check_version()
+        index = self.data.add_node()
+        while len(self._reverse) <= index:
+            self._reverse.add_node()
+        missing = index + 1 - len(self._distances)
+        if missing > 0:
+            self._parents = np.append(self._parents, np.full(missing, -1, dtype=self._parents.dtype))
+            self._distances = np.append(self._distances, np.full(missing, -1, dtype=self._distances.dtype))
+        self._version = self.data.version
+        return index
+
+    def add_edge(self, i, j, weight=1, **kwargs):
+        # kwargs уходят графу как есть (например, directed=False у матрицы инцидентности)
+        self._check_version()
+        self.data.add_edge(i, j, weight, **kwargs)
+        self._sync([(i, j), (j, i)])
+
+    def remove_edge(self, i, j):
+        self._check_version()
+        self.data.remove_edge(i, j)
+        self._sync([(i, j), (j, i)])
+
+    def add_edges(self, sources, targets, weights=None, **kwargs):
+        self._check_version()
+        self.data.add_edges(sources, targets, weights, **kwargs)
+        self._sync(self._pairs(sources, targets))
+
+    def remove_edges(self, sources, targets):
+        self._check_version()
+        self.data.remove_edges(sources, targets)
+        self._sync(self._pairs(sources, targets))
+
+    @staticmethod
+    def _pairs(sources, targets) -> list:
+        pairs = list(zip(np.asarray(sources).tolist(), np.asarray(targets).tolist()))
+        return pairs + [(j, i) for i, j in pairs]
+
+    def _check_version(self):
+        if self._version != self.data.version:
+            self.refresh()
+
+    def _sync(self, pairs):
+        """
+        Сверяет дуги pairs в графе с обратным CSR и чинит расстояния.
+
+        Представления по-разному трактуют изменения (матрица инцидентности удаляет рёбра в обе
+        стороны, повторная дуга может заменить вес), поэтому фактическое изменение берётся из графа.
+        """
+        self._version = self.data.version
+        for i, j in dict.fromkeys(pairs):
+            present = bool(np.any(np.asarray(self.data.connections(i)) == j))
+            known = self._reverse.has_edge(j, i)
+            if present and not known:
+                self._reverse.add_edge(j, i)
+                self._insert(i, j)
+            elif known and not present:
+                self._reverse.remove_edge(j, i)
+                self._delete(i, j)
+
+    def _insert(self, i, j):
+        distances, parents = self._distances, self._parents
+        if distances[i] == -1 or (distances[j] != -1 and distances[j] <= distances[i] + 1):
+            return
+        distances[j] = distances[i] + 1
+        parents[j] = i
+        frontier = deque([j])
+        while frontier:
+            index = frontier.popleft()
+            need_indexes = np.asarray(self.data.connections(index), dtype=np.int64)
+            improved = need_indexes[(distances[need_indexes] == -1) |
+                                    (distances[need_indexes] > distances[index] + 1)]
+            improved = np.unique(improved)
+            distances[improved] = distances[index] + 1
+            parents[improved] = index
+            frontier.extend(improved.tolist())
+
+    def _delete(self, i, j):
+        distances, parents = self._distances, self._parents
+        if parents[j] != i:
+            return
+        # другой родитель на том же уровне сохраняет расстояния всего поддерева
+        candidates = np.asarray(self._reverse.connections(j), dtype=np.int64)
+        same_level = candidates[distances[candidates] == distances[j] - 1]
+        if len(same_level):
+            parents[j] = same_level[0]
+            return
+
+        subtree = [j]
+        affected = {j}
+        for index in subtree:
+            need_indexes = np.asarray(self.data.connections(index), dtype=np.int64)
+            for child in need_indexes[parents[need_indexes] == index].tolist():
+                if child not in affected:
+                    affected.add(child)
+                    subtree.append(child)
+        distances[subtree] = -1
+        parents[subtree] = -1
+
+        # начальные оценки — по входящим дугам из вершин вне поддерева
+        heap = []
+        for index in subtree:
+            candidates = np.asarray(self._reverse.connections(index), dtype=np.int64)
+            candidates = candidates[distances[candidates] != -1]
+            if len(candidates):
+                best = candidates[np.argmin(distances[candidates])]
+                heap.append((int(distances[best]) + 1, index, int(best)))
+        heapq.heapify(heap)
+        while heap:
+            distance, index, parent = heapq.heappop(heap)
+            if distances[index] != -1:
+                continue
+            distances[index] = distance
+            parents[index] = parent
+            for new_index in np.asarray(self.data.connections(index), dtype=np.int64).tolist():
+                if new_index in affected and distances[new_index] == -1:
+                    heapq.heappush(heap, (distance + 1, new_index, index))
@@ -0,0 +1,125 @@
+import numpy as np
+from conversion import to_adjacency_matrix
+from type_presentation import AdjacencyMatrix
+
+
+class FloydWarshall():
+    """
+    Алгоритм Флойда — Уоршелла для плотных графов
+
+    Кратчайшие расстояния между всеми парами вершин по матрице смежности. Для каждой опорной вершины k
+    два внутренних цикла заменены одной операцией NumPy: D = min(D, D[:, k] + D[k, :]).
+    При заданном block_size матрица обрабатывается полосами по block_size строк (блочный вариант):
+    сначала для опорного блока досчитываются его строки и столбцы, затем каждая полоса остальных строк
+    прогоняется через все опорные вершины блока, пока она лежит в кэше. Расстояния блочного варианта
+    те же, но при отрицательных весах на циклах нулевой длины его порядок обновлений может замкнуть
+    предшественников в цикл, поэтому графы с отрицательными весами всегда считаются обычным вариантом.
+    Матрица предшественников P[i, j] хранит вершину перед j на кратчайшем пути из i.
+    Отрицательные веса допустимы, отрицательные циклы — нет (ValueError).
+    """
+    def __init__(self, data, block_size=None):
+        self.data = data
+        self.block_size = block_size
+        self._result = None
+
+    def distances(self, data=None) -> np.ndarray:
+        """Матрица кратчайших расстояний (inf — недостижимо)."""
+        if data is not None:
+            self.data = data
+        return self._solve()[0]
+
+    def predecessors(self, data=None) -> np.ndarray:
+        """Матрица предшественников (-1 — пути нет)."""
+        if data is not None:
+            self.data = data
+        return self._solve()[1]
+
+    def finding_way(self, vertices:tuple, data=None) -> list:
+        if data is not None:
+            self.data = data
+        start, end = vertices
+        distances, predecessors = self._solve()
+        if np.isinf(distances[start, end]):
+            return None
+        way = [end]
+        while way[-1] != start:
+            # простой путь короче числа вершин; более длинная цепочка — испорченная матрица предшественников
+            if len(way) > len(predecessors):
+                raise RuntimeError(f"predecessor chain from {start} to {end} does not reach the start")
+            way.append(int(predecessors[start, way[-1]]))
+        return way[::-1]
+
+    def _solve(self):
+        if self._result is None or self._result[0] is not self.data or self._result[1] != self.data.version:
+            matrix = to_adjacency_matrix(self.data).matrix
+            distances, predecessors = self._initial(matrix)
+            if self.block_size is None or np.any(matrix < 0):
+                self._relax(distances, predecessors, slice(None), range(len(distances)))
+            else:
+                self._solve_blocked(distances, predecessors, self.block_size)
+            if np.any(np.diag(distances) < 0):
+                raise ValueError("Graph contains a negative cycle")
+            self._result = (self.data, self.data.version, distances, predecessors)
+        return self._result[2:]
+
+    @staticmethod
+    def _initial(matrix):
+        num_nodes = max(matrix.shape)
+        distances = np.full((num_nodes, num_nodes), np.inf)
+        predecessors = np.full((num_nodes, num_nodes), -1, dtype=np.int32 if num_nodes < 2 ** 31 else np.int64)
+        rows, columns = np.nonzero(matrix)
+        distances[rows, columns] = matrix[rows, columns]
+        predecessors[rows, columns] = rows
+        diagonal = np.arange(num_nodes)
+        distances[diagonal, diagonal] = np.minimum(distances[diagonal, diagonal], 0)
+        predecessors[diagonal, diagonal] = diagonal
+        return distances, predecessors
+
+    @staticmethod
+    def _relax(distances, predecessors, rows, pivots):
+        """Пропускает строки rows (срез, меняется на месте) через опорные вершины pivots по очереди."""
+        block = distances[rows]
+        block_predecessors = predecessors[rows]
+        # буферы выделяются один раз на все опорные вершины
+        candidates = np.empty_like(block)
+        improved = np.empty(block.shape, dtype=bool)
+        for k in pivots:
+            np.add(block[:, k, None], distances[None, k, :], out=candidates)
+            np.less(candidates, block, out=improved)
+            np.copyto(block, candidates, where=improved)
+            np.copyto(block_predecessors, predecessors[None, k, :], where=improved)
+
+    def _solve_blocked(self, distances, predecessors, block_size):
+        num_nodes = len(distances)
+        for first in range(0, num_nodes, block_size):
+            pivots = range(first, min(first + block_size, num_nodes))
+            pivot_rows = slice(pivots.start, pivots.stop)
+            # строки и столбцы опорного блока: сначала сами строки блока, затем остальные строки по столбцам блока
+            for k in pivots:
+                candidates = distances[pivot_rows, k, None] + distances[None, k, :]
+                improved = candidates < distances[pivot_rows]
+                np.minimum(distances[pivot_rows], candidates, out=distances[pivot_rows])
+                np.copyto(predecessors[pivot_rows], np.broadcast_to(predecessors[k], improved.shape), where=improved)
+
+                candidates = distances[:, k, None] + distances[None, k, pivot_rows]
+                improved = candidates < distances[:, pivot_rows]
+                np.minimum(distances[:, pivot_rows], candidates, out=distances[:, pivot_rows])
+                np.copyto(predecessors[:, pivot_rows], np.broadcast_to(predecessors[k, pivot_rows], improved.shape),
+                          where=improved)
+            # остальные полосы строк целиком
+            for start in range(0, num_nodes, block_size):
+                if start != first:
+                    self._relax(distances, predecessors, slice(start, min(start + block_size, num_nodes)), pivots)
+
+
+if __name__ == "__main__":
+    matrix = np.array([
+        [0, 3, 0, 0, 5],  # Вершина 0
+        [0, 0, 1, 0, 0],  # Вершина 1
+        [0, 0, 0, 7, 0],  # Вершина 2
+        [0, 0, 0, 0, 2],  # Вершина 3
+        [0, 4, 0, 0, 0]   # Вершина 4
+    ])
+    my_class = FloydWarshall(AdjacencyMatrix(matrix))
+    print(my_class.distances())
+    print(my_class.finding_way((0, 3)))
@@ -0,0 +1,24 @@
+"""Общие для тестов графы и списки представлений."""
+import numpy as np
+from type_presentation import AdjacencyMatrix, IncidenceMatrix, AdjacencyList, EdgeList, CompressedSparseRow
+
+
+presentations = [AdjacencyMatrix, IncidenceMatrix, AdjacencyList, EdgeList, CompressedSparseRow]
+
+
+def random_graph(nodes, density, seed, max_weight=9, closing_weight=None, symmetric=False) -> AdjacencyMatrix:
+    """
+    Случайный ориентированный граф без петель с весами 1..max_weight, дуга есть с вероятностью density.
+
+    closing_weight — вес дуги 0 -> последняя вершина (при symmetric=True и обратной дуги): последняя
+    вершина не остаётся изолированной, иначе список рёбер её потеряет.
+    """
+    rng = np.random.default_rng(seed)
+    matrix = rng.integers(1, max_weight + 1, size=(nodes, nodes))
+    matrix[rng.random((nodes, nodes)) > density] = 0
+    np.fill_diagonal(matrix, 0)
+    if closing_weight is not None:
+        matrix[0, -1] = closing_weight
+        if symmetric:
+            matrix[-1, 0] = closing_weight
+    return AdjacencyMatrix(matrix)
@@ -0,0 +1,115 @@
+import warnings
+import numpy as np
+from itertools import islice
+from type_presentation import EdgeList, CompressedSparseRow
+
+
+class _GrowingArray():
+    """Одномерный массив с амортизированным ростом (удвоением ёмкости)."""
+    def __init__(self, dtype, capacity=1024):
+        self._buffer = np.empty(max(capacity, 1), dtype=dtype)
+        self._size = 0
+
+    def extend(self, values):
+        needed = self._size + len(values)
+        if needed > len(self._buffer):
+            buffer = np.empty(max(needed, 2 * len(self._buffer)), dtype=self._buffer.dtype)
+            buffer[:self._size] = self._buffer[:self._size]
+            self._buffer = buffer
+        self._buffer[self._size:needed] = values
+        self._size = needed
+
+    @property
+    def values(self) -> np.ndarray:
+        return self._buffer[:self._size]
+
+    def trim(self) -> np.ndarray:
+        """Отдаёт лишнюю ёмкость (перевыделение на месте, без копии) и возвращает значения."""
+        self._buffer.resize(self._size, refcheck=False)
+        return self._buffer
+
+
+class _IdMap():
+    """Переименование произвольных целых номеров вершин в 0..V-1 в порядке появления по кускам."""
+    def __init__(self):
+        self._sorted_ids = np.empty(0, dtype=np.int64)
+        self._sorted_indexes = np.empty(0, dtype=np.int64)
+        self.ids = _GrowingArray(np.int64)
+
+    def __call__(self, ids):
+        unique = np.unique(ids)
+        positions = np.searchsorted(self._sorted_ids, unique)
+        known = positions < len(self._sorted_ids)
+        known[known] = self._sorted_ids[positions[known]] == unique[known]
+        new_ids = unique[~known]
+        if len(new_ids):
+            new_indexes = np.arange(len(self.ids.values), len(self.ids.values) + len(new_ids))
+            self._sorted_ids = np.insert(self._sorted_ids, positions[~known], new_ids)
+            self._sorted_indexes = np.insert(self._sorted_indexes, positions[~known], new_indexes)
+            self.ids.extend(new_ids)
+        return self._sorted_indexes[np.searchsorted(self._sorted_ids, ids)]
+
+
+def read_edge_list(path, delimiter=None, weighted=True, comments="#", skip_header=0, chunk_lines=1_000_000,
+                   remap=True, deduplicate=True, presentation=EdgeList, weight_dtype=np.float64,
+                   expected_edges=None):
+    """
+    Потоковое чтение большого текстового списка рёбер (CSV/TSV).
+
+    Файл читается кусками по chunk_lines строк, каждый кусок разбирается np.loadtxt и сразу
+    дописывается в растущие массивы источников, приёмников и весов, так что в памяти держатся
+    только выходные массивы и один кусок текста. Строки вида "источник приёмник [вес]";
+    при weighted=False вес каждой дуги равен 1. expected_edges позволяет сразу выделить нужную ёмкость.
+
+    При remap=True номера вершин (любые целые) переименовываются в 0..V-1, при deduplicate=True
+    из повторяющихся дуг остаётся первая. presentation — EdgeList или CompressedSparseRow.
+    Возвращает (граф, node_ids), где node_ids[i] — исходный номер вершины i (None без remap).
+    """
+    capacity = expected_edges or 1024
+    # один разбор куска на все столбцы: номера вершин целые, вес — weight_dtype
+    columns = [("source", np.int64), ("target", np.int64)] + ([("weight", weight_dtype)] if weighted else [])
+    sources = _GrowingArray(np.int64, capacity)
+    targets = _GrowingArray(np.int64, capacity)
+    weights = _GrowingArray(weight_dtype, capacity)
+    id_map = _IdMap() if remap else None
+
+    with open(path, "r") as file:
+        for _ in range(skip_header):
+            next(file, None)
+        while True:
+            lines = list(islice(file, chunk_lines))
+            if not lines:
+                break
+            with warnings.catch_warnings():
+                # кусок может состоять из одних комментариев
+                warnings.filterwarnings("ignore", message="loadtxt: input contained no data")
+                table = np.loadtxt(lines, dtype=columns, delimiter=delimiter, comments=comments,
+                                   usecols=range(len(columns)), ndmin=1)
+            chunk_sources, chunk_targets = table["source"], table["target"]
+            if id_map is not None:
+                indexes = id_map(np.concatenate((chunk_sources, chunk_targets)))
+                chunk_sources, chunk_targets = indexes[:len(table)], indexes[len(table):]
+            sources.extend(chunk_sources)
+            targets.extend(chunk_targets)
+            weights.extend(table["weight"] if weighted else np.ones(len(table), dtype=weight_dtype))
+
+    sources, targets, weights = sources.trim(), targets.trim(), weights.trim()
+    # отсортированные таблицы переименования больше не нужны, остаётся только node_ids
+    node_ids = id_map.ids.trim() if id_map is not None else None
+    del id_map
+    num_nodes = len(node_ids) if node_ids is not None else int(max(sources.max(initial=-1),
+                                                                    targets.max(initial=-1))) + 1
+    if deduplicate and len(sources):
+        # устойчивая сортировка сохраняет порядок файла среди одинаковых дуг, берём первую
+        order = np.lexsort((targets, sources))
+        sources, targets = sources[order], targets[order]
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = (sources[1:] != sources[:-1]) | (targets[1:] != targets[:-1])
+        sources, targets, weights = sources[first], targets[first], weights[order[first]]
+
+    if presentation is CompressedSparseRow:
+        return CompressedSparseRow.from_edges(sources, targets, weights, num_nodes=num_nodes), node_ids
+    elif presentation is EdgeList:
+        dtype = np.result_type(np.int64, weight_dtype)
+        return EdgeList(np.column_stack((sources.astype(dtype), targets.astype(dtype), weights))), node_ids
+    raise TypeError(f"invalid presentation ({presentation})")
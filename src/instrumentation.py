@@ -0,0 +1,110 @@
+import time
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+
+
+@dataclass
+class TraversalMetrics:
+    """
+    Счётчики обхода
+
+    Атрибуты:
+        nodes_expanded (int) - сколько вершин раскрыто (для них запрошены соседи)
+        edges_scanned (int) - сколько дуг просмотрено при раскрытии
+        peak_frontier (int) - наибольший размер очереди / стека / фронта
+        connections_calls (int) - вызовы connections() графа (считаются под InstrumentedGraph)
+        weight_calls (int) - вызовы weight() графа (считаются под InstrumentedGraph)
+        phase_times (dict) - суммарное время по фазам ("setup", "search", "path") в секундах
+    """
+    nodes_expanded: int = 0
+    edges_scanned: int = 0
+    peak_frontier: int = 0
+    connections_calls: int = 0
+    weight_calls: int = 0
+    phase_times: dict = field(default_factory=dict)
+
+
+class Instrumentation():
+    """
+    Метрики обходов по запросу
+
+    Передаётся движку (BFS(data, instrumentation=...), DFS(data, instrumentation=...)) и копит
+    TraversalMetrics по всем его запросам. callback(event, index, value) вызывается на каждом шаге:
+    "expand" — раскрыта вершина index, value — её соседи; "level" — BFS по уровням раскрыл фронт,
+    index — номер уровня, value — новый фронт.
+    Без объекта Instrumentation движки ничего не считают: в цикле остаётся одна проверка на None,
+    а фазы оборачиваются в пустой контекст.
+    """
+    def __init__(self, callback=None):
+        self.callback = callback
+        self.metrics = TraversalMetrics()
+
+    def reset(self):
+        self.metrics = TraversalMetrics()
+
+    def expand(self, index, need_indexes, frontier_size):
+        metrics = self.metrics
+        metrics.nodes_expanded += 1
+        metrics.edges_scanned += len(need_indexes)
+        if frontier_size > metrics.peak_frontier:
+            metrics.peak_frontier = frontier_size
+        if self.callback is not None:
+            self.callback("expand", index, need_indexes)
+
+    def expand_level(self, level, frontier, expanded, scanned):
+        metrics = self.metrics
+        metrics.nodes_expanded += expanded
+        metrics.edges_scanned += scanned
+        metrics.peak_frontier = max(metrics.peak_frontier, len(frontier))
+        if self.callback is not None:
+            self.callback("level", level, frontier)
+
+    @contextmanager
+    def phase(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            times = self.metrics.phase_times
+            times[name] = times.get(name, 0.0) + time.perf_counter() - started
+
+
+def phase(instrumentation, name):
+    """Контекст замера фазы или пустой контекст, если метрики не включены."""
+    return nullcontext() if instrumentation is None else instrumentation.phase(name)
+
+
+class InstrumentedGraph():
+    """
+    Подсчёт вызовов connections() и weight() графа
+
+    Контекстный менеджер: на время блока методы экземпляра графа подменяются обёртками,
+    которые увеличивают счётчики в instrumentation.metrics; на выходе подмена снимается.
+    Класс графа и остальные объекты, ссылающиеся на граф, не меняются, isinstance по-прежнему верен.
+
+        with InstrumentedGraph(data, probe):
+            BFS(data, instrumentation=probe).finding_way((0, 5))
+    """
+    def __init__(self, data, instrumentation):
+        self.data = data
+        self.instrumentation = instrumentation
+
+    def __enter__(self):
+        connections, weight = self.data.connections, self.data.weight
+
+        def counted_connections(index):
+            self.instrumentation.metrics.connections_calls += 1
+            return connections(index)
+
+        def counted_weight(i, j):
+            self.instrumentation.metrics.weight_calls += 1
+            return weight(i, j)
+
+        self.data.connections = counted_connections
+        self.data.weight = counted_weight
+        return self.data
+
+    def __exit__(self, *exc_info):
+        del self.data.connections
+        del self.data.weight
+        return False
@@ -0,0 +1,91 @@
+import heapq
+import numpy as np
+from components import DisjointSet
+from conversion import arcs
+from type_presentation import AdjacencyMatrix, AdjacencyList, EdgeList, CompressedSparseRow
+
+
+def kruskal(data) -> EdgeList:
+    """
+    Минимальный остовный лес алгоритмом Краскала.
+
+    Дуги берутся из представления одним векторным проходом (arcs), сортируются по весу одним
+    np.argsort, затем просматриваются по возрастанию с объединением компонент в DisjointSet.
+    Просмотр заканчивается, как только выбрано V - 1 ребро. Направления дуг не учитываются.
+    Время O(E log E), вызовов weight(i, j) нет.
+    """
+    num_nodes, sources, targets, weights = arcs(data)
+    loops = sources == targets
+    if loops.any():
+        sources, targets, weights = sources[~loops], targets[~loops], weights[~loops]
+    order = np.argsort(weights, kind="stable")
+
+    components = DisjointSet(num_nodes)
+    union = components.union
+    chosen = []
+    for position, i, j in zip(order.tolist(), sources[order].tolist(), targets[order].tolist()):
+        if union(i, j):
+            chosen.append(position)
+            if len(chosen) == num_nodes - 1:
+                break
+    chosen = np.array(chosen, dtype=np.int64)
+    return _edge_list(sources[chosen], targets[chosen], weights[chosen])
+
+
+def prim(data, start=0) -> EdgeList:
+    """
+    Минимальный остовный лес алгоритмом Прима с двоичной кучей.
+
+    Граф приводится к симметричному CSR (каждая дуга в обе стороны), дерево растёт из start,
+    кандидаты хранятся в куче с ленивым удалением. Если граф несвязен, дерево достраивается
+    из следующей непокрытой вершины. Время O(E log E).
+    """
+    num_nodes, sources, targets, weights = arcs(data)
+    if num_nodes == 0:
+        return _edge_list(sources, targets, weights)
+    csr = CompressedSparseRow.from_edges(np.concatenate((sources, targets)), np.concatenate((targets, sources)),
+                                         np.concatenate((weights, weights)), num_nodes=num_nodes)
+    indptr, indices, arc_weights = csr.indptr.tolist(), csr.indices.tolist(), csr.weights.tolist()
+
+    visited = [False] * num_nodes
+    tree_sources, tree_targets, tree_weights = [], [], []
+    for root in [start] + list(range(num_nodes)):
+        if visited[root]:
+            continue
+        visited[root] = True
+        heap = [(arc_weights[position], indices[position], root) for position in range(indptr[root], indptr[root + 1])]
+        heapq.heapify(heap)
+        while heap:
+            weight, index, parent = heapq.heappop(heap)
+            if visited[index]:
+                continue
+            visited[index] = True
+            tree_sources.append(parent)
+            tree_targets.append(index)
+            tree_weights.append(weight)
+            for position in range(indptr[index], indptr[index + 1]):
+                if not visited[indices[position]]:
+                    heapq.heappush(heap, (arc_weights[position], indices[position], index))
+    return _edge_list(np.array(tree_sources, dtype=np.int64), np.array(tree_targets, dtype=np.int64),
+                      np.array(tree_weights, dtype=csr.weights.dtype))
+
+
+def minimum_spanning_tree(data, method=None, **kwargs) -> EdgeList:
+    """
+    Минимальный остовный лес в виде списка рёбер (источник, приёмник, вес).
+
+    По умолчанию матрица и список смежности идут через prim, остальные представления,
+    где рёбра уже лежат плоскими массивами, — через kruskal.
+    """
+    if method is None:
+        method = "prim" if isinstance(data, (AdjacencyMatrix, AdjacencyList)) else "kruskal"
+    if method == "kruskal":
+        return kruskal(data)
+    elif method == "prim":
+        return prim(data, **kwargs)
+    raise ValueError(f"invalid method ({method})")
+
+
+def _edge_list(sources, targets, weights) -> EdgeList:
+    dtype = np.result_type(sources.dtype, weights.dtype)
+    return EdgeList(np.column_stack((sources.astype(dtype), targets.astype(dtype), weights.astype(dtype))))
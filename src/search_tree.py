@@ -0,0 +1,79 @@
+import numpy as np
+from dataclasses import dataclass
+
+
+@dataclass
+class SearchTree:
+    """
+    Дерево поиска из одной вершины
+
+    Результат обхода графа: для каждой вершины хранится её родитель в дереве поиска и расстояние
+    от исходной вершины. По родителям путь восстанавливается за O(длины пути).
+    Если поиск остановился досрочно (найдена конечная вершина), дерево может быть неполным.
+
+    Атрибуты:
+        source (int) - вершина, из которой выполнялся поиск
+        parents (np.ndarray) - родитель каждой вершины (-1 у исходной и недостигнутых вершин)
+        distances (np.ndarray) - расстояние от source (-1 для недостигнутых вершин при подсчёте переходов)
+        trace (SearchTrace) - запись шагов обхода, если поиск шёл с record=True
+    """
+    source: int
+    parents: np.ndarray
+    distances: np.ndarray
+    trace: "SearchTrace" = None
+
+    def reachable(self, end) -> bool:
+        return end == self.source or self.parents[end] != -1
+
+    def way(self, end) -> list:
+        """Путь от source до end по родителям или None, если end не достигнута."""
+        if not self.reachable(end):
+            return None
+        way = [int(end)]
+        while way[-1] != self.source:
+            way.append(int(self.parents[way[-1]]))
+        return way[::-1]
+
+
+@dataclass
+class SearchTrace:
+    """
+    Запись шагов обхода
+
+    Обход с record=True не рисует ничего сам, а складывает по одной записи на каждую снятую с очереди
+    или стека вершину. Записи — два массива одной длины, поэтому запись компактна и её можно
+    воспроизвести (NetworxGraphVisualizer.replay) или отрисовать в файл (NetworxGraphVisualizer.render)
+    уже после поиска.
+
+    Атрибуты:
+        order (np.ndarray) - вершина, раскрытая на каждом шаге
+        parent_steps (np.ndarray) - шаг, на котором была раскрыта родительская вершина (-1 у начальной)
+    """
+    order: np.ndarray
+    parent_steps: np.ndarray
+
+    def __len__(self):
+        return len(self.order)
+
+    def way(self, step) -> list:
+        """Путь от начальной вершины до вершины шага step, каким его видел обход в этот момент."""
+        way = []
+        while step != -1:
+            way.append(int(self.order[step]))
+            step = self.parent_steps[step]
+        return way[::-1]
+
+
+class TraceRecorder():
+    """Накопитель шагов обхода: списки Python при поиске, массивы NumPy в конце."""
+    def __init__(self):
+        self.order = []
+        self.parent_steps = []
+
+    def step(self, index, parent_step) -> int:
+        self.order.append(int(index))
+        self.parent_steps.append(int(parent_step))
+        return len(self.order) - 1
+
+    def trace(self) -> SearchTrace:
+        return SearchTrace(np.array(self.order, dtype=np.int64), np.array(self.parent_steps, dtype=np.int64))
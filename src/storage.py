@@ -0,0 +1,72 @@
+import struct
+import numpy as np
+from conversion import to_csr
+from type_presentation import CompressedSparseRow
+
+
+MAGIC = b"SNGRAPH1"
+FORMAT_VERSION = 1
+# магия, версия формата, резерв, число вершин, число дуг, типы indptr/indices/weights
+HEADER = struct.Struct("<8sIIQQ8s8s8s")
+HEADER_SIZE = 64
+ALIGNMENT = 64
+
+
+def _aligned(offset) -> int:
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def _layout(num_nodes, num_edges, dtypes):
+    """Смещения массивов indptr, indices, weights в файле (каждый выровнен по 64 байта)."""
+    offsets = []
+    offset = HEADER_SIZE
+    for count, dtype in zip((num_nodes + 1, num_edges, num_edges), dtypes):
+        offsets.append(offset)
+        offset = _aligned(offset + count * dtype.itemsize)
+    return offsets
+
+
+def save_graph(data, path):
+    """
+    Сохраняет граф любого представления в двоичный файл.
+
+    Файл — заголовок на 64 байта и три сырых массива CSR (indptr, indices, weights),
+    каждый с выравниванием по 64 байта, так что load_graph отображает их в память без разбора.
+    """
+    csr = to_csr(data)
+    arrays = [np.ascontiguousarray(array) for array in (csr.indptr, csr.indices, csr.weights)]
+    dtypes = [array.dtype for array in arrays]
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(csr), len(csr.indices),
+                         *(dtype.str.encode() for dtype in dtypes))
+    with open(path, "wb") as file:
+        file.write(header.ljust(HEADER_SIZE, b"\0"))
+        for array, offset in zip(arrays, _layout(len(csr), len(csr.indices), dtypes)):
+            file.write(b"\0" * (offset - file.tell()))
+            array.tofile(file)
+
+
+def load_graph(path, mode="r") -> CompressedSparseRow:
+    """
+    Открывает граф, сохранённый save_graph, как CSR поверх np.memmap.
+
+    Файл не читается целиком: открытие занимает время чтения заголовка, а с диска подгружаются
+    только те страницы массивов, к которым обращается поиск. mode передаётся в np.memmap
+    ("r" — только чтение, "c" — копирование при записи, "r+" — изменения пишутся в файл).
+    """
+    with open(path, "rb") as file:
+        header = file.read(HEADER_SIZE)
+    if len(header) < HEADER.size or header[:len(MAGIC)] != MAGIC:
+        raise ValueError(f"{path}: not a graph file")
+    _, version, _, num_nodes, num_edges, *dtypes = HEADER.unpack(header[:HEADER.size])
+    if version != FORMAT_VERSION:
+        raise ValueError(f"{path}: unsupported format version {version}")
+
+    dtypes = [np.dtype(dtype.rstrip(b"\0").decode()) for dtype in dtypes]
+    arrays = []
+    for count, dtype, offset in zip((num_nodes + 1, num_edges, num_edges), dtypes,
+                                    _layout(num_nodes, num_edges, dtypes)):
+        if count == 0:
+            arrays.append(np.empty(0, dtype=dtype))
+        else:
+            arrays.append(np.memmap(path, dtype=dtype, mode=mode, offset=offset, shape=(count,)))
+    return CompressedSparseRow(*arrays)
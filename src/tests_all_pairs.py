@@ -0,0 +1,83 @@
+import pytest
+import numpy as np
+
+from type_presentation import AdjacencyMatrix, EdgeList
+from bfs import BFS
+from dijkstra import Dijkstra
+from apsp import AllPairs
+from floyd_warshall import FloydWarshall
+from graph_samples import random_graph
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_all_pairs_hops(processes):
+    data = random_graph(40, 0.08, 0)
+    distances = AllPairs(data, processes=processes, chunk_size=7).distances()
+    bfs = BFS(data)
+    for start in range(40):
+        assert np.array_equal(distances[start], bfs.search_tree(start).distances)
+
+
+def test_all_pairs_weighted_to_memmap(tmp_path):
+    data = random_graph(30, 0.1, 1)
+    distances = AllPairs(data, processes=2).distances(weighted=True, out=tmp_path / "distances.bin")
+    assert isinstance(distances, np.memmap)
+    dijkstra = Dijkstra(data)
+    for start in range(30):
+        assert np.array_equal(distances[start], dijkstra.distances(start))
+
+
+def test_all_pairs_worker_failure():
+    data = EdgeList(np.array([[0, 1, -1], [1, 2, 1]]))
+    with pytest.raises(RuntimeError):
+        AllPairs(data, processes=2, chunk_size=1).distances(weighted=True)
+
+
+@pytest.mark.parametrize("block_size", [None, 1, 4, 7, 64])
+def test_floyd_warshall(block_size):
+    data = random_graph(25, 0.12, 2)
+    solver = FloydWarshall(data, block_size=block_size)
+    distances = solver.distances()
+    dijkstra = Dijkstra(data)
+    for start in range(25):
+        assert np.array_equal(distances[start], dijkstra.distances(start))
+        for end in range(25):
+            way = solver.finding_way((start, end))
+            if way is None:
+                assert np.isinf(distances[start, end])
+            else:
+                assert way[0] == start and way[-1] == end
+                assert sum(data.matrix[i, j] for i, j in zip(way, way[1:])) == distances[start, end]
+
+
+@pytest.mark.parametrize("seed", [80, 156, 219, 271, 296])
+def test_floyd_warshall_blocked_paths_with_negative_weights(seed):
+    # веса -1..9 дают циклы нулевой длины, на которых блочный порядок замыкал предшественников
+    rng = np.random.default_rng(seed)
+    matrix = rng.integers(-1, 10, (13, 13)) * (rng.random((13, 13)) < 0.35)
+    plain = FloydWarshall(AdjacencyMatrix(matrix))
+    blocked = FloydWarshall(AdjacencyMatrix(matrix), block_size=3)
+    distances = plain.distances()
+    assert np.array_equal(blocked.distances(), distances)
+    for start in range(13):
+        for end in range(13):
+            way = blocked.finding_way((start, end))
+            assert way == plain.finding_way((start, end))
+            if way is not None:
+                assert sum(matrix[i, j] for i, j in zip(way, way[1:])) == distances[start, end]
+
+
+def test_floyd_warshall_broken_predecessors_raise():
+    solver = FloydWarshall(AdjacencyMatrix(np.array([[0, 1, 0], [0, 0, 1], [0, 1, 0]])))
+    predecessors = solver.predecessors()
+    predecessors[0, 1], predecessors[0, 2] = 2, 1
+    with pytest.raises(RuntimeError):
+        solver.finding_way((0, 2))
+
+
+def test_floyd_warshall_negative_weights():
+    matrix = np.array([[0, 4, 1], [0, 0, 0], [0, -2, 0]])
+    assert FloydWarshall(AdjacencyMatrix(matrix)).finding_way((0, 1)) == [0, 2, 1]
+    matrix[1, 2] = 1
+    with pytest.raises(ValueError):
+        FloydWarshall(AdjacencyMatrix(matrix), block_size=2).distances()
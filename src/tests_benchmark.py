@@ -0,0 +1,46 @@
+import json
+import numpy as np
+
+from conversion import arcs
+from benchmark import GENERATORS, generate, run, compare, main
+
+
+def test_generators_are_reproducible():
+    for kind in GENERATORS:
+        first, second = generate(kind, 500, seed=3), generate(kind, 500, seed=3)
+        assert np.array_equal(first.matrix, second.matrix)
+        _, sources, targets, _ = arcs(first)
+        assert 250 <= len(first) <= 510
+        assert not np.any(sources == targets)
+        # дуга к последней вершине не дублирует случайную
+        assert len(np.unique(first.matrix[:, :2], axis=0)) == len(first)
+
+
+def test_generator_does_not_duplicate_closing_arc():
+    table = generate("dense", 20, seed=0)
+    nodes = int(table.matrix[:, :2].max()) + 1
+    assert len(np.unique(table.matrix[:, :2], axis=0)) == len(table)
+    assert [nodes - 1, 0] in table.matrix[:, :2].tolist()
+
+
+def test_run_and_compare(tmp_path):
+    report = run(graphs=("grid", "sparse"), sizes=(100,), samples=20, queries=2, repeat=1, max_bytes=10**9)
+    operations = {(record["presentation"], record["operation"]) for record in report["results"]}
+    assert len(operations) == 25
+    assert all(record["peak_bytes"] >= 0 and record["throughput"] > 0 for record in report["results"])
+    assert compare(report, report) == []
+
+    slower = json.loads(json.dumps(report))
+    slower["results"][0]["seconds"] *= 2
+    assert [record["ratio"] for record in compare(report, slower)] == [2]
+
+    skipped = run(graphs=("sparse",), sizes=(100,), presentations=("incidence_matrix",), max_bytes=1)
+    assert skipped["results"] == [dict(graph="sparse", edges=skipped["results"][0]["edges"], nodes=25,
+                                       presentation="incidence_matrix", operation="construction", skipped=True)]
+
+    baseline = tmp_path / "baseline.json"
+    assert main(["--graphs", "grid", "--sizes", "100", "--presentations", "csr", "--repeat", "1",
+                 "--output", str(baseline)]) == 0
+    assert json.loads(baseline.read_text())["meta"]["seed"] == 0
+    assert main(["--graphs", "grid", "--sizes", "100", "--presentations", "csr", "--repeat", "1",
+                 "--compare", str(baseline), "--threshold", "1000"]) == 0
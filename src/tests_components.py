@@ -0,0 +1,70 @@
+import sys
+import pytest
+import numpy as np
+import networkx as nx
+
+from type_presentation import AdjacencyList, CompressedSparseRow
+from conversion import convert
+from components import DisjointSet, Components, weak_components, strong_components
+from bfs import BFS
+from dfs import DFS
+from graph_samples import presentations, random_graph
+
+
+def _same_partition(labels, groups):
+    expected = np.empty(len(labels), dtype=np.int64)
+    for number, group in enumerate(groups):
+        expected[list(group)] = number
+    # метки совпадают с точностью до перенумерации
+    return len(set(zip(labels.tolist(), expected.tolist()))) == len(groups) == labels.max() + 1
+
+
+def test_disjoint_set():
+    components = DisjointSet(6)
+    assert components.union(4, 5)
+    assert components.union(1, 4)
+    assert not components.union(5, 1)
+    assert components.find(5) == components.find(1)
+    assert components.labels().tolist() == [0, 1, 2, 3, 1, 1]
+
+
+params = [(presentation, seed) for presentation in presentations for seed in range(4)]
+@pytest.mark.parametrize("presentation, seed", params)
+def test_components_match_networkx(presentation, seed):
+    matrix = random_graph(15, 0.08, seed, closing_weight=9)
+    data = convert(matrix, presentation)
+    graph = nx.from_numpy_array(matrix.matrix, create_using=nx.DiGraph)
+    assert _same_partition(weak_components(data), list(nx.weakly_connected_components(graph)))
+    for method in ("tarjan", "kosaraju"):
+        assert _same_partition(strong_components(data, method), list(nx.strongly_connected_components(graph)))
+
+
+@pytest.mark.parametrize("method", ["tarjan", "kosaraju"])
+def test_strong_components_deep_graph(method):
+    # цепочка длиннее предела рекурсии
+    nodes = sys.getrecursionlimit() * 3
+    data = CompressedSparseRow.from_edges(np.arange(nodes), (np.arange(nodes) + 1) % nodes)
+    assert strong_components(data, method).tolist() == [0] * nodes
+    data.remove_edge(nodes - 1, 0)
+    assert strong_components(data, method).tolist() == list(range(nodes))
+
+
+def test_components_reject_queries():
+    data = AdjacencyList([[(1, 1)], [(0, 1)], [(3, 1)], []])
+    components = Components(data)
+    assert components.number_of_components() == 2
+    assert components.number_of_components(strong=True) == 3
+    assert [group.tolist() for group in components.groups()] == [[0, 1], [2, 3]]
+    assert components.strongly_connected(0, 1) and not components.strongly_connected(2, 3)
+
+    bfs, dfs = BFS(data, components), DFS(data, components)
+    calls = []
+    data.connections = lambda index: calls.append(index) or AdjacencyList.connections(data, index)
+    assert bfs.finding_way((0, 3)) is None
+    assert dfs.finding_way((0, 2)) is None
+    assert calls == []
+    assert bfs.finding_way((2, 3)) == [2, 3]
+
+    data.add_edge(1, 2)
+    assert components.connected(0, 3)
+    assert dfs.finding_way((0, 3)) == [0, 1, 2, 3]
@@ -0,0 +1,57 @@
+import pytest
+import numpy as np
+
+from type_presentation import AdjacencyMatrix, AdjacencyList, EdgeList
+from conversion import convert, to_adjacency_matrix, to_incidence_matrix, is_symmetric
+from graph_samples import presentations
+
+
+def _random_matrix(nodes, directed, weighted, seed):
+    rng = np.random.default_rng(seed)
+    matrix = rng.integers(1, 9 if weighted else 2, size=(nodes, nodes))
+    matrix[rng.random((nodes, nodes)) < 0.6] = 0
+    if not directed:
+        matrix = np.triu(matrix)
+        matrix = matrix + np.triu(matrix, 1).T
+    return AdjacencyMatrix(matrix)
+
+
+params = [(presentation, directed, weighted)
+          for presentation in presentations for directed in (True, False) for weighted in (True, False)]
+@pytest.mark.parametrize("presentation, directed, weighted", params)
+def test_round_trip(presentation, directed, weighted):
+    for seed in range(5):
+        source = _random_matrix(8, directed, weighted, seed)
+        # гарантируем, что последняя вершина не изолирована, иначе список рёбер её не сохранит
+        source.matrix[0, -1] = source.matrix[-1, 0] = 3
+        converted = convert(source, presentation)
+        assert isinstance(converted, presentation)
+        assert np.array_equal(to_adjacency_matrix(converted).matrix, source.matrix)
+        for other in presentations:
+            assert np.array_equal(to_adjacency_matrix(convert(converted, other)).matrix, source.matrix)
+
+
+@pytest.mark.parametrize("presentation", presentations)
+def test_connections_and_weights_preserved(presentation):
+    source = _random_matrix(10, True, True, 42)
+    np.fill_diagonal(source.matrix, 0)
+    converted = convert(source, presentation)
+    for i in range(10):
+        assert sorted(np.asarray(converted.connections(i)).tolist()) == np.nonzero(source.matrix[i])[0].tolist()
+
+
+def test_incidence_matrix_encoding():
+    undirected = _random_matrix(6, False, True, 1)
+    assert is_symmetric(undirected)
+    matrix = to_incidence_matrix(undirected).matrix
+    # у неориентированного ребра вес записан у обоих концов, отрицательных значений нет
+    assert matrix.min() >= 0
+    assert matrix.shape[1] == np.count_nonzero(np.triu(undirected.matrix))
+
+    directed = AdjacencyMatrix(np.array([[0, 5], [0, 0]]))
+    assert to_incidence_matrix(directed).matrix.tolist() == [[5], [-1]]
+
+
+def test_adjacency_list_keeps_order():
+    data = AdjacencyList([[(2, 7), (1, 3)], [(0, 3)], [(0, 7)]])
+    assert convert(convert(data, EdgeList), AdjacencyList).data == data.data
@@ -1,7 +1,7 @@
 import pytest
 import numpy as np
 
-from type_presentation import AdjacencyMatrix, IncidenceMatrix, AdjacencyList, EdgeList
+from type_presentation import AdjacencyMatrix, IncidenceMatrix, AdjacencyList, EdgeList, CompressedSparseRow
 
 
 def _test_all_methods(obj):
@@ -59,6 +59,23 @@ def test_adjacency_list(nodes):
     )
     _test_all_methods(obj)
 
+
+params = [i for i in range(2, 20)]
+@pytest.mark.parametrize("nodes", params)
+def test_compressed_sparse_row(nodes):
+    matrix = np.random.randint(0, 6, size=(nodes, nodes))
+    sources, targets = np.nonzero(matrix)
+    obj = CompressedSparseRow.from_edges(sources, targets, matrix[sources, targets], num_nodes=nodes)
+
+    assert obj.shape == (nodes, nodes)
+    assert obj.nodes() == list(range(nodes))
+    for i in range(nodes):
+        assert np.array_equal(obj.connections(i), np.nonzero(matrix[i])[0])
+        # срез без копирования
+        assert obj.connections(i).base is not None
+        for j in range(nodes):
+            assert obj.weight(i, j) == matrix[i, j]
+
 # params = [i for i in range(2, 20)]
 
 # @pytest.mark.parametrize("nodes", params)
@@ -79,3 +96,226 @@ def test_adjacency_list(nodes):
 #     obj = EdgeList(edges)
 #     _test_all_methods(obj)
 
+
+
+params = [i for i in range(2, 20)]
+@pytest.mark.parametrize("nodes", params)
+def test_indexed_edge_list(nodes):
+    edges = np.random.randint(0, nodes, size=(nodes * 3, 3))
+    indexed, plain = EdgeList(edges), EdgeList(edges, indexed=False)
+
+    assert indexed.nodes() == plain.nodes() == np.unique(edges[:, :2]).tolist()
+    for i in range(nodes + 1):
+        assert sorted(indexed.connections(i).tolist()) == sorted(plain.connections(i).tolist())
+        for j in range(nodes):
+            assert sorted(indexed.weight(i, j).tolist()) == sorted(plain.weight(i, j).tolist())
+
+
+def _random_incidence(nodes, edges, directed):
+    matrix = np.zeros((nodes, edges), dtype=int)
+    for column in range(edges):
+        i, j = np.random.choice(nodes, size=2, replace=False)
+        matrix[i, column] = np.random.randint(1, 6)
+        matrix[j, column] = -1 if directed else matrix[i, column]
+    return matrix
+
+
+params = [(i, directed) for i in range(2, 20) for directed in (True, False)]
+@pytest.mark.parametrize("nodes, directed", params)
+def test_incidence_matrix_index(nodes, directed):
+    matrix = _random_incidence(nodes, nodes * 2, directed)
+    obj = IncidenceMatrix(matrix)
+    for i in range(nodes):
+        # полный просмотр матрицы: исходящие столбцы вершины и их вторые концы
+        outgoing = np.nonzero(matrix[i] > 0)[0]
+        rows = np.nonzero(matrix[:, outgoing])[0]
+        assert obj.connections(i).tolist() == np.unique(rows[rows != i]).tolist()
+        for j in obj.connections(i):
+            common = np.intersect1d(np.nonzero(matrix[i])[0], np.nonzero(matrix[j])[0])
+            assert obj.weight(i, j) in np.abs(matrix[[i, j]][:, common])
+
+
+params = [i for i in range(2, 20)]
+@pytest.mark.parametrize("nodes", params)
+def test_compact_adjacency_list(nodes):
+    adjacency_list = []
+    for _ in range(nodes):
+        neighbors = np.random.choice(nodes, size=np.random.randint(0, nodes), replace=False)
+        adjacency_list.append([(int(neighbor), np.random.randint(1, 5)) for neighbor in neighbors])
+    plain, compact = AdjacencyList(adjacency_list), AdjacencyList(adjacency_list, compact=True)
+
+    assert len(compact) == len(plain)
+    assert sorted(compact.nodes()) == sorted(plain.nodes())
+    for i in range(nodes):
+        assert compact.connections(i).tolist() == sorted(plain.connections(i))
+        assert sorted(compact[i]) == sorted(plain[i])
+        for j in range(nodes):
+            assert compact.weight(i, j) == plain.weight(i, j)
+    assert [sorted(neighbors) for neighbors in compact.data] == [sorted(neighbors) for neighbors in plain.data]
+
+
+def _arc_dict(obj):
+    from conversion import arcs
+    _, sources, targets, weights = arcs(obj)
+    return dict(zip(zip(sources.tolist(), targets.tolist()), weights.tolist()))
+
+
+mutable = [
+    lambda matrix: AdjacencyMatrix(matrix.copy()),
+    lambda matrix: AdjacencyList([[(int(j), int(matrix[i, j])) for j in np.nonzero(row)[0]]
+                                  for i, row in enumerate(matrix)]),
+    lambda matrix: AdjacencyList([[(int(j), int(matrix[i, j])) for j in np.nonzero(row)[0]]
+                                  for i, row in enumerate(matrix)], compact=True),
+    lambda matrix: EdgeList(np.column_stack(np.nonzero(matrix) + (matrix[np.nonzero(matrix)],))),
+    lambda matrix: EdgeList(np.column_stack(np.nonzero(matrix) + (matrix[np.nonzero(matrix)],)), indexed=False),
+    lambda matrix: CompressedSparseRow.from_edges(*np.nonzero(matrix), matrix[np.nonzero(matrix)],
+                                                  num_nodes=len(matrix)),
+]
+@pytest.mark.parametrize("make", mutable)
+def test_mutations(make):
+    rng = np.random.default_rng(0)
+    matrix = rng.integers(1, 9, size=(6, 6))
+    matrix[rng.random((6, 6)) > 0.3] = 0
+    matrix[0, 5] = 1
+    obj = make(matrix)
+    expected = {(i, j): int(matrix[i, j]) for i, j in zip(*np.nonzero(matrix))}
+    num_nodes = 6
+
+    for step in range(200):
+        version = obj.version
+        action = rng.integers(0, 5)
+        if action == 0 and step % 20 == 0:
+            assert obj.add_node() == num_nodes
+            num_nodes += 1
+        elif action <= 1:
+            i, j, weight = *rng.integers(0, num_nodes, size=2).tolist(), int(rng.integers(1, 9))
+            obj.add_edge(i, j, weight)
+            expected[(i, j)] = weight
+        elif action == 2:
+            i, j = rng.integers(0, num_nodes, size=2).tolist()
+            obj.remove_edge(i, j)
+            expected.pop((i, j), None)
+        elif action == 3:
+            sources, targets = rng.integers(0, num_nodes, size=(2, 4))
+            weights = rng.integers(1, 9, size=4)
+            obj.add_edges(sources, targets, weights)
+            expected.update(zip(zip(sources.tolist(), targets.tolist()), weights.tolist()))
+        else:
+            sources, targets = rng.integers(0, num_nodes, size=(2, 4))
+            obj.remove_edges(sources, targets)
+            for key in zip(sources.tolist(), targets.tolist()):
+                expected.pop(key, None)
+        assert obj.version > version
+
+        for i in range(num_nodes):
+            assert sorted(np.asarray(obj.connections(i)).tolist()) == sorted(j for (k, j) in expected if k == i)
+        assert _arc_dict(obj) == expected
+
+
+def test_incidence_matrix_mutations():
+    obj = IncidenceMatrix(np.array([[1], [-1], [0]]))
+    assert obj.add_node() == 3
+    obj.add_edge(1, 3, 5)
+    obj.add_edge(2, 3, 4, directed=False)
+    assert obj.connections(1).tolist() == [3]
+    assert obj.connections(3).tolist() == [2]
+    assert obj.weight(3, 2) == 4
+    obj.remove_edge(0, 1)
+    assert obj.connections(0).tolist() == []
+    assert obj.matrix.shape == (4, 2)
+    obj.add_edges([0, 0], [1, 2], [7, 8])
+    obj.remove_edges([3], [2])
+    assert _arc_dict(obj) == {(1, 3): 5, (0, 1): 7, (0, 2): 8}
+    assert obj.connections(0).tolist() == [1, 2]
+
+
+def test_adjacency_matrix_capacity_doubling():
+    obj = AdjacencyMatrix(np.zeros((2, 2), dtype=int))
+    for _ in range(5):
+        obj.add_node()
+    assert obj.shape == (7, 7)
+    assert obj._buffer.shape == (8, 8)
+    obj.add_edge(6, 0, 3)
+    assert obj.connections(6).tolist() == [0]
+
+
+def test_unindexed_edge_list_add_node():
+    obj = EdgeList(np.array([[0, 1, 1]]), indexed=False)
+    assert obj.add_node() == 2
+    assert obj.add_node() == 3
+    assert obj.number_of_nodes() == 4
+    assert obj.connections(3).tolist() == []
+
+
+def test_mutations_after_matrix_reassignment():
+    obj = AdjacencyMatrix(np.zeros((2, 2), dtype=int))
+    obj.add_node()
+    obj.matrix = np.array([[0, 7], [7, 0]])
+    obj.add_node()
+    assert obj.matrix.tolist() == [[0, 7, 0], [7, 0, 0], [0, 0, 0]]
+
+    obj = EdgeList(np.array([[0, 1, 1]]), indexed=False)
+    obj.add_edge(1, 2, 3)
+    obj.matrix = [[5, 6, 9]]
+    obj.add_edge(0, 1, 4)
+    assert obj.matrix.tolist() == [[5, 6, 9], [0, 1, 4]]
+
+    obj = IncidenceMatrix(np.array([[1], [-1], [0]]))
+    obj.add_edge(1, 2)
+    obj.matrix = np.array([[0], [1], [-1]])
+    obj.add_edge(0, 1, 3)
+    assert obj.matrix.tolist() == [[0, 3], [1, -1], [-1, 0]]
+
+
+def test_batch_mutations_keep_indices_incremental():
+    csr = CompressedSparseRow.from_edges([0, 1], [1, 2], [1, 1], num_nodes=4)
+    csr.add_edges([2, 3], [3, 0], [5, 6])
+    csr.remove_edges([0], [1])
+    assert csr._delta and csr.indices.tolist() == [1, 2]
+    assert csr.has_edge(2, 3) and not csr.has_edge(0, 1) and not csr.has_edge(3, 2)
+    csr.add_edge(3, 2, 0)
+    assert csr.has_edge(3, 2) and csr.weight(3, 2) == 0
+    csr.remove_edge(3, 2)
+    assert _arc_dict(csr) == {(1, 2): 1, (2, 3): 5, (3, 0): 6}
+
+    obj = IncidenceMatrix(np.array([[1, 0], [-1, 1], [0, -1]]))
+    obj.add_edges([0, 2, 0], [2, 2, 1], [4, 5, 6], directed=False)
+    obj.remove_edges([1], [2])
+    rebuilt = IncidenceMatrix(obj.matrix.copy())
+    for i in range(3):
+        assert obj.connections(i).tolist() == rebuilt.connections(i).tolist()
+        assert np.array_equal(obj.weight(i, 2), rebuilt.weight(i, 2))
+
+
+def test_incidence_matrix_remove_edge_keeps_reverse_arc():
+    # дуги 0 -> 1 и 1 -> 0 отдельными столбцами, плюс параллельная дуга 0 -> 1
+    obj = IncidenceMatrix(np.array([[1, -1, 4], [-1, 2, -1]]))
+    obj.remove_edge(1, 0)
+    assert obj.matrix.tolist() == [[1, 4], [-1, -1]]
+    assert obj.connections(0).tolist() == [1] and obj.connections(1).tolist() == []
+    obj.add_edge(1, 0, 3)
+    obj.remove_edges([0], [1])
+    assert obj.matrix.tolist() == [[-1], [3]]
+    assert obj.connections(0).tolist() == [] and obj.connections(1).tolist() == [0]
+    obj.add_edge(0, 1, 5, directed=False)
+    obj.remove_edge(1, 0)
+    assert obj.matrix.shape == (2, 0)
+
+
+@pytest.mark.parametrize("indexed", [True, False])
+def test_edge_list_parallel_rows(indexed):
+    obj = EdgeList(np.array([[0, 1, 5], [1, 2, 1], [0, 1, 7]]), indexed=indexed)
+    assert obj.connections(0).tolist() == [1, 1]
+    obj.add_edge(0, 1, 3)
+    assert obj.matrix.tolist() == [[0, 1, 3], [1, 2, 1]]
+    assert obj.connections(0).tolist() == [1] and obj.weight(0, 1).tolist() == [3]
+
+    obj = EdgeList(np.array([[0, 1, 5], [1, 2, 1], [0, 1, 7]]), indexed=indexed)
+    obj.add_edges([0, 1], [1, 2], [3, 4])
+    assert sorted(obj.matrix.tolist()) == [[0, 1, 3], [1, 2, 4]]
+    assert obj.connections(0).tolist() == [1]
+
+    obj = EdgeList(np.array([[0, 1, 5], [1, 2, 1], [0, 1, 7]]), indexed=indexed)
+    obj.remove_edge(0, 1)
+    assert obj.matrix.tolist() == [[1, 2, 1]]
+    assert obj.connections(0).tolist() == [] and len(obj.weight(0, 1)) == 0
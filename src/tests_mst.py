@@ -0,0 +1,60 @@
+import pytest
+import numpy as np
+import networkx as nx
+
+from type_presentation import AdjacencyMatrix, AdjacencyList, EdgeList, CompressedSparseRow
+from conversion import convert
+from components import weak_components
+from mst import kruskal, prim, minimum_spanning_tree
+from graph_samples import presentations, random_graph
+
+
+def _forest_weight(matrix):
+    graph = nx.Graph()
+    graph.add_nodes_from(range(len(matrix)))
+    for i, j in zip(*np.nonzero(matrix)):
+        if not graph.has_edge(i, j) or graph[i][j]["weight"] > matrix[i, j]:
+            graph.add_edge(i, j, weight=matrix[i, j])
+    forest = nx.minimum_spanning_tree(graph)
+    return forest.size(weight="weight"), forest.number_of_edges()
+
+
+params = [(presentation, method, seed) for presentation in presentations
+          for method in ("kruskal", "prim") for seed in range(3)]
+@pytest.mark.parametrize("presentation, method, seed", params)
+def test_minimum_spanning_tree_matches_networkx(presentation, method, seed):
+    matrix = random_graph(20, 0.1, seed, max_weight=49, closing_weight=49)
+    data = convert(matrix, presentation)
+    tree = minimum_spanning_tree(data, method)
+    assert isinstance(tree, EdgeList)
+    weight, edges = _forest_weight(matrix.matrix)
+    assert len(tree) == edges
+    assert tree.matrix[:, 2].sum() == weight
+    # рёбра дерева связывают те же вершины, что и граф
+    labels = weak_components(data)
+    tree_labels = weak_components(CompressedSparseRow.from_edges(tree.matrix[:, 0], tree.matrix[:, 1],
+                                                                 num_nodes=matrix.number_of_nodes()))
+    assert len(set(zip(labels.tolist(), tree_labels.tolist()))) == labels.max() + 1 == tree_labels.max() + 1
+
+
+def test_kruskal_on_large_edge_list():
+    rng = np.random.default_rng(0)
+    nodes, edges = 2000, 20000
+    matrix = np.column_stack((rng.integers(0, nodes, edges), rng.integers(0, nodes, edges), rng.random(edges)))
+    matrix[:nodes - 1, :2] = np.column_stack((np.arange(nodes - 1), np.arange(1, nodes)))
+    data = EdgeList(matrix)
+    tree = kruskal(data)
+    assert len(tree) == nodes - 1
+    assert tree.matrix[:, 2].sum() == pytest.approx(prim(data).matrix[:, 2].sum())
+
+
+@pytest.mark.parametrize("method", ["kruskal", "prim"])
+def test_minimum_spanning_tree_of_empty_graph(method):
+    for data in (AdjacencyMatrix(np.zeros((0, 0), dtype=int)), EdgeList(np.zeros((0, 3), dtype=int)),
+                 CompressedSparseRow.from_edges([], [], [], num_nodes=0)):
+        assert minimum_spanning_tree(data, method=method).matrix.shape == (0, 3)
+
+
+def test_minimum_spanning_tree_invalid_method():
+    with pytest.raises(ValueError):
+        minimum_spanning_tree(AdjacencyList([[(1, 1)], []]), "boruvka")
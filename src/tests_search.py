@@ -0,0 +1,313 @@
+import pytest
+import numpy as np
+
+from type_presentation import AdjacencyMatrix, AdjacencyList, EdgeList
+from conversion import convert
+from bfs import BFS
+from dfs import DFS
+from dijkstra import Dijkstra
+from astar import AStar
+from batch import BatchQuery
+from cache import CachedSearch
+from dynamic import DynamicDistances
+from instrumentation import Instrumentation, InstrumentedGraph
+from visualization import NetworxGraphVisualizer
+from graph_samples import presentations, random_graph
+
+
+params = [(presentation, seed) for presentation in presentations for seed in range(5)]
+@pytest.mark.parametrize("presentation, seed", params)
+def test_bfs_visited_matches_paths(presentation, seed):
+    data = convert(random_graph(9, 0.25, seed, closing_weight=9, symmetric=True), presentation)
+    bfs = BFS(data)
+    for start in range(9):
+        for end in range(9):
+            assert bfs.finding_way((start, end)) == bfs.finding_way((start, end), mode="paths")
+
+
+def test_bfs_search_tree_distances():
+    data = AdjacencyList([[(1, 1)], [(2, 1)], [(0, 1)], []])
+    tree = BFS(data).search_tree(0)
+    assert tree.distances.tolist() == [0, 1, 2, -1]
+    assert tree.way(2) == [0, 1, 2]
+    assert tree.way(3) is None
+
+
+def _is_way(data, way, start, end):
+    return (way[0] == start and way[-1] == end
+            and all(nxt in np.asarray(data.connections(cur)).tolist() for cur, nxt in zip(way, way[1:])))
+
+
+params = [(presentation, seed) for presentation in presentations for seed in range(5)]
+@pytest.mark.parametrize("presentation, seed", params)
+def test_dfs_visited_finds_valid_way(presentation, seed):
+    data = convert(random_graph(9, 0.25, seed, closing_weight=9, symmetric=True), presentation)
+    dfs = DFS(data)
+    for start in range(9):
+        for end in range(9):
+            way = dfs.finding_way((start, end))
+            legacy = dfs.finding_way((start, end), mode="paths")
+            assert (way is None) == (legacy is None)
+            if way is not None:
+                assert _is_way(data, way, start, end)
+                assert len(set(way)) == len(way)
+
+
+def test_dfs_step_hook_and_silence(capsys):
+    data = AdjacencyList([[(1, 1), (2, 1)], [(3, 1)], [(3, 1)], []])
+    steps = []
+    way = DFS(data).finding_way((0, 3), step_hook=lambda index, need_indexes: steps.append(index))
+    assert way == [0, 2, 3]
+    assert steps == [0, 2]
+    assert capsys.readouterr().out == ""
+
+
+params = [(presentation, seed) for presentation in presentations for seed in range(5)]
+@pytest.mark.parametrize("presentation, seed", params)
+def test_bfs_frontier_matches_visited(presentation, seed):
+    data = convert(random_graph(12, 0.15, seed, closing_weight=9, symmetric=True), presentation)
+    bfs = BFS(data)
+    for start in range(12):
+        tree = bfs.frontier_tree(start)
+        assert np.array_equal(tree.distances, bfs.search_tree(start).distances)
+        for end in range(12):
+            way = bfs.finding_way((start, end), mode="frontier")
+            if way is None:
+                assert tree.distances[end] == -1
+            else:
+                assert len(way) - 1 == tree.distances[end]
+                assert _is_way(data, way, start, end)
+
+
+def test_bfs_frontier_reuses_csr_until_graph_changes():
+    data = EdgeList(np.array([[0, 1, 1], [1, 2, 1]]))
+    bfs = BFS(data)
+    assert bfs.finding_way((0, 2), mode="frontier") == [0, 1, 2]
+    csr = bfs._forward_csr()
+    assert bfs.finding_way((1, 2), mode="frontier") == [1, 2]
+    assert bfs._forward_csr() is csr
+    data.add_edge(0, 2)
+    assert bfs.finding_way((0, 2), mode="frontier") == [0, 2]
+    assert bfs._forward_csr() is not csr
+
+
+params = [(presentation, seed) for presentation in presentations for seed in range(5)]
+@pytest.mark.parametrize("presentation, seed", params)
+def test_bfs_bidirectional_is_shortest(presentation, seed):
+    data = convert(random_graph(12, 0.15, seed, closing_weight=9, symmetric=True), presentation)
+    bfs = BFS(data)
+    for start in range(12):
+        distances = bfs.search_tree(start).distances
+        for end in range(12):
+            way = bfs.finding_way((start, end), mode="bidirectional")
+            if way is None:
+                assert distances[end] == -1
+            else:
+                assert len(way) - 1 == distances[end]
+                assert _is_way(data, way, start, end)
+
+
+def _bellman_ford(matrix, start):
+    distances = np.full(len(matrix), np.inf)
+    distances[start] = 0
+    sources, targets = np.nonzero(matrix)
+    for _ in range(len(matrix)):
+        for i, j in zip(sources, targets):
+            distances[j] = min(distances[j], distances[i] + matrix[i, j])
+    return distances
+
+
+params = [(presentation, seed) for presentation in presentations for seed in range(3)]
+@pytest.mark.parametrize("presentation, seed", params)
+def test_dijkstra_distances(presentation, seed):
+    source = random_graph(10, 0.2, seed, closing_weight=9, symmetric=True)
+    dijkstra = Dijkstra(convert(source, presentation))
+    for start in range(10):
+        expected = _bellman_ford(source.matrix, start)
+        assert np.array_equal(dijkstra.distances(start), expected)
+        for end in range(10):
+            way = dijkstra.finding_way((start, end))
+            if np.isinf(expected[end]):
+                assert way is None
+            else:
+                assert sum(source.matrix[i, j] for i, j in zip(way, way[1:])) == expected[end]
+                assert dijkstra.distance((start, end)) == expected[end]
+
+
+def test_dijkstra_rejects_negative_weights():
+    with pytest.raises(ValueError):
+        Dijkstra(EdgeList(np.array([[0, 1, -2]]))).finding_way((0, 1))
+
+
+def _grid(size, seed):
+    # решётка size x size, вес ребра не меньше евклидова расстояния между узлами
+    rng = np.random.default_rng(seed)
+    nodes = size * size
+    coordinates = np.array([(i // size, i % size) for i in range(nodes)], dtype=float)
+    matrix = np.zeros((nodes, nodes))
+    for i in range(nodes):
+        for j in (i + 1, i + size):
+            if j < nodes and (j != i + 1 or j % size):
+                matrix[i, j] = matrix[j, i] = 1 + rng.integers(0, 3)
+    return AdjacencyMatrix(matrix), coordinates
+
+
+@pytest.mark.parametrize("metric", ["euclidean", "manhattan"])
+def test_astar_matches_dijkstra(metric):
+    data, coordinates = _grid(6, 0)
+    astar, dijkstra = AStar(data, coordinates=coordinates, metric=metric), Dijkstra(data)
+    for start in range(0, 36, 5):
+        for end in range(36):
+            way = astar.finding_way((start, end))
+            weight = sum(data.matrix[i, j] for i, j in zip(way, way[1:]))
+            assert weight == dijkstra.distance((start, end))
+
+
+def test_astar_callable_heuristic():
+    data, coordinates = _grid(4, 1)
+    calls = []
+    def heuristic(indexes, end):
+        calls.append(len(indexes))
+        return np.zeros(len(indexes))
+    assert AStar(data, heuristic=heuristic).distance((0, 15)) == Dijkstra(data).distance((0, 15))
+    assert calls
+
+
+@pytest.mark.parametrize("engine", [BFS, DFS, Dijkstra])
+def test_batch_query_matches_single_queries(engine):
+    data = convert(random_graph(12, 0.15, 3, closing_weight=9, symmetric=True), EdgeList)
+    rng = np.random.default_rng(0)
+    pairs = rng.integers(0, 12, size=(60, 2))
+    result = BatchQuery(data, engine=engine).finding_ways(pairs)
+    single = engine(data)
+    for k, (start, end) in enumerate(pairs.tolist()):
+        tree = single.search_tree(start)
+        assert result.way(k) == tree.way(end)
+        assert result.distances[k] == tree.distances[end]
+    assert result.ways.shape[0] == len(pairs)
+
+
+def test_cached_search_lru_and_invalidation(capsys):
+    data = AdjacencyList([[(1, 1)], [(2, 1)], []])
+    cached = CachedSearch(BFS(data), maxsize=2)
+    assert cached.finding_way((0, 2)) == [0, 1, 2]
+    assert cached.finding_way((0, 1)) == [0, 1]
+    assert (cached.hits, cached.misses) == (1, 1)
+
+    cached.finding_way((1, 2))
+    cached.finding_way((2, 0))
+    # вершина 0 вытеснена как давно не использованная
+    cached.finding_way((0, 2))
+    assert cached.misses == 4
+
+    data.data = [[(2, 1)], [], []]
+    assert cached.finding_way((0, 2)) == [0, 2]
+    assert cached.misses == 5
+
+
+@pytest.mark.parametrize("presentation", presentations)
+def test_dynamic_distances_match_bfs(presentation):
+    rng = np.random.default_rng(1)
+    data = convert(random_graph(12, 0.1, 1, closing_weight=9, symmetric=True), presentation)
+    dynamic = DynamicDistances(data, 0)
+    for step in range(150):
+        i, j = rng.integers(0, 12, size=2).tolist()
+        if i == j:
+            continue
+        if step % 3:
+            dynamic.add_edge(i, j)
+        else:
+            dynamic.remove_edge(i, j)
+        tree = BFS(data).search_tree(0)
+        assert dynamic.distances.tolist() == tree.distances.tolist()
+        way = dynamic.finding_way(j)
+        assert way is None if tree.distances[j] == -1 else len(way) == tree.distances[j] + 1
+
+
+def test_dynamic_distances_batches_and_new_nodes():
+    data = AdjacencyList([[(1, 1)], [(2, 1)], [(3, 1)], []])
+    dynamic = DynamicDistances(data, 0)
+    assert dynamic.add_node() == 4
+    assert dynamic.distance(4) == -1
+    dynamic.add_edges([3, 0], [4, 3])
+    assert dynamic.distances.tolist() == [0, 1, 2, 1, 2]
+    dynamic.remove_edges([0], [3])
+    assert dynamic.distances.tolist() == [0, 1, 2, 3, 4]
+    assert dynamic.finding_way(4) == [0, 1, 2, 3, 4]
+    # изменение в обход объекта ведёт к полному пересчёту
+    data.remove_edge(1, 2)
+    assert not dynamic.reachable(4)
+
+
+@pytest.mark.parametrize("engine, mode", [(BFS, "visited"), (BFS, "frontier"), (BFS, "bidirectional"),
+                                          (BFS, "paths"), (DFS, "visited"), (DFS, "paths")])
+def test_instrumentation_counters(engine, mode):
+    # звезда 0 -> 1..4 и цепочка 4 -> 5 -> 6
+    data = AdjacencyList([[(1, 1), (2, 1), (3, 1), (4, 1)], [], [], [], [(5, 1)], [(6, 1)], []])
+    events = []
+    probe = Instrumentation(callback=lambda event, index, value: events.append((event, index)))
+    with InstrumentedGraph(data, probe):
+        assert engine(data, instrumentation=probe).finding_way((0, 6), mode=mode) == [0, 4, 5, 6]
+    metrics = probe.metrics
+    assert metrics.nodes_expanded >= 3
+    assert metrics.edges_scanned >= 6
+    assert metrics.peak_frontier >= 3
+    assert events and events[0][0] in ("expand", "level")
+    assert set(metrics.phase_times) == {"setup", "search", "path"}
+    # вне блока методы графа прежние, счётчики вызовов больше не растут
+    calls = metrics.connections_calls
+    BFS(data).finding_way((0, 6))
+    assert probe.metrics.connections_calls == calls
+    assert "connections" not in vars(data)
+
+
+def test_instrumentation_exact_bfs_counts():
+    data = AdjacencyList([[(1, 1), (2, 1)], [(2, 1)], [(3, 1)], []])
+    probe = Instrumentation()
+    with InstrumentedGraph(data, probe):
+        BFS(data, instrumentation=probe).search_tree(0)
+        data.weight(0, 1)
+    assert (probe.metrics.nodes_expanded, probe.metrics.edges_scanned, probe.metrics.peak_frontier) == (4, 4, 2)
+    assert (probe.metrics.connections_calls, probe.metrics.weight_calls) == (4, 1)
+    probe.reset()
+    assert probe.metrics.nodes_expanded == 0
+
+
+trace_graph = AdjacencyList([[(1, 1), (2, 1)], [(3, 1)], [(3, 1)], [(4, 1)], []])
+
+
+@pytest.mark.parametrize("engine, mode", [(DFS, "visited"), (DFS, "paths"), (BFS, "visited")])
+def test_search_records_trace(engine, mode):
+    searcher = engine(trace_graph)
+    way = searcher.finding_way((0, 4), mode=mode, record=True)
+    trace = searcher.trace
+    assert trace.order[0] == 0 and trace.order[-1] == 4
+    assert trace.way(len(trace) - 1) == way
+    assert trace.parent_steps[0] == -1 and np.all(trace.parent_steps[1:] < np.arange(1, len(trace)))
+    # путь на каждом шаге идёт по дугам графа
+    for step in range(len(trace)):
+        ways = trace.way(step)
+        assert all(j in trace_graph.connections(i) for i, j in zip(ways, ways[1:]))
+
+
+def test_bfs_trace_order_and_unsupported_mode():
+    bfs = BFS(trace_graph)
+    bfs.finding_way((0, 4), record=True)
+    assert bfs.trace.order.tolist() == [0, 1, 2, 3, 4]
+    assert bfs.trace.way(3) == [0, 1, 3]
+    with pytest.raises(ValueError):
+        bfs.finding_way((0, 4), mode="frontier", record=True)
+
+
+def test_display_replays_after_search(monkeypatch, tmp_path):
+    frames = []
+    monkeypatch.setattr(NetworxGraphVisualizer, "replay", lambda self, trace: frames.append(trace))
+    monkeypatch.setattr(NetworxGraphVisualizer, "draw_graph", lambda self, layout=None: None)
+    dfs = DFS(trace_graph)
+    assert dfs.finding_way((0, 4), display=True, time_sleep=0.001) == dfs.finding_way((0, 4))
+    assert frames == [dfs.trace]
+
+    visualizer = NetworxGraphVisualizer(trace_graph)
+    target = tmp_path / "dfs.gif"
+    visualizer.render(dfs.trace, target, fps=10, dpi=20, layout="circular")
+    assert target.stat().st_size > 0
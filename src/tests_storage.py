@@ -0,0 +1,64 @@
+import pytest
+import numpy as np
+
+from type_presentation import AdjacencyMatrix, EdgeList, CompressedSparseRow
+from conversion import convert, to_adjacency_matrix
+from storage import save_graph, load_graph
+from bfs import BFS
+from ingest import read_edge_list
+from graph_samples import presentations
+
+
+@pytest.mark.parametrize("presentation", presentations)
+def test_save_and_load(presentation, tmp_path):
+    rng = np.random.default_rng(0)
+    matrix = rng.integers(1, 9, size=(15, 15))
+    matrix[rng.random((15, 15)) > 0.2] = 0
+    matrix[0, -1] = 4
+    data = convert(AdjacencyMatrix(matrix), presentation)
+
+    path = tmp_path / "graph.bin"
+    save_graph(data, path)
+    loaded = load_graph(path)
+    assert isinstance(loaded.indices, np.memmap)
+    assert np.array_equal(to_adjacency_matrix(loaded).matrix, matrix)
+    assert BFS(loaded).finding_way((0, 14)) == [0, 14]
+
+
+def test_load_rejects_other_files(tmp_path):
+    path = tmp_path / "graph.bin"
+    path.write_bytes(b"not a graph")
+    with pytest.raises(ValueError):
+        load_graph(path)
+
+
+def test_empty_graph(tmp_path):
+    path = tmp_path / "graph.bin"
+    save_graph(AdjacencyMatrix(np.zeros((3, 3), dtype=int)), path)
+    loaded = load_graph(path)
+    assert len(loaded) == 3
+    assert len(loaded.connections(1)) == 0
+
+
+@pytest.mark.parametrize("presentation", [EdgeList, CompressedSparseRow])
+def test_read_edge_list(presentation, tmp_path):
+    path = tmp_path / "edges.tsv"
+    path.write_text("# source\ttarget\tweight\n"
+                    "100\t205\t1.5\n"
+                    "205\t7\t2\n"
+                    "100\t205\t9\n"
+                    "7\t100\t4\n"
+                    "205\t100\t3\n")
+    data, node_ids = read_edge_list(path, delimiter="\t", chunk_lines=2, presentation=presentation)
+    assert node_ids.tolist() == [100, 205, 7]
+    assert data.number_of_nodes() == 3
+    matrix = to_adjacency_matrix(data).matrix
+    assert matrix.tolist() == [[0, 1.5, 0], [3, 0, 2], [4, 0, 0]]
+
+
+def test_read_unweighted_edge_list_without_remap(tmp_path):
+    path = tmp_path / "edges.csv"
+    path.write_text("from,to\n0,3\n3,1\n")
+    data, node_ids = read_edge_list(path, delimiter=",", weighted=False, skip_header=1, remap=False)
+    assert node_ids is None
+    assert BFS(data).finding_way((0, 1)) == [0, 3, 1]
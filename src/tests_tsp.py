@@ -0,0 +1,78 @@
+import itertools
+import pytest
+import numpy as np
+
+from type_presentation import AdjacencyMatrix, AdjacencyList, CompressedSparseRow
+from tsp import AntColony, distance_matrix, tour_length, local_search, two_opt_move, or_opt_move
+
+
+def _brute_force(distances):
+    n = len(distances)
+    return min(tour_length(distances, (0,) + way) for way in itertools.permutations(range(1, n)))
+
+
+def _check_tour(tour, n):
+    assert tour.vertices[0] == tour.vertices[-1] == 0
+    assert sorted(tour.vertices[:-1]) == list(range(n))
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_ant_colony_finds_optimum_on_small_graphs(seed):
+    rng = np.random.default_rng(seed)
+    matrix = rng.integers(1, 100, size=(8, 8))
+    np.fill_diagonal(matrix, 0)
+    if seed % 2:
+        matrix = np.minimum(matrix, matrix.T)
+    data = AdjacencyMatrix(matrix)
+    tour = AntColony(data, seed=seed).finding_way(iterations=30)
+    _check_tour(tour, 8)
+    distances = distance_matrix(data)
+    assert tour.distance == tour_length(distances, tour.vertices[:-1]) == _brute_force(distances)
+
+
+def test_ant_colony_sparse_graph_and_other_presentations():
+    # единственный гамильтонов цикл 0 -> 1 -> ... -> 5 -> 0 плюс лишние дуги
+    data = AdjacencyList([[(1, 1), (3, 1)], [(2, 1)], [(3, 1)], [(4, 1), (1, 1)], [(5, 1)], [(0, 1)]])
+    tour = AntColony(data, seed=0).finding_way(iterations=20)
+    assert tour.vertices == [0, 1, 2, 3, 4, 5, 0]
+    assert tour.distance == 6
+
+    data = CompressedSparseRow.from_edges([0, 1, 2], [1, 2, 0])
+    data.add_node()
+    tour = AntColony(data, seed=0).finding_way(iterations=5)
+    assert tour.vertices is None and tour.distance == float("inf")
+
+
+def test_local_search_reaches_two_opt_and_or_opt_optimum():
+    rng = np.random.default_rng(0)
+    points = rng.random((60, 2))
+    distances = distance_matrix(AdjacencyMatrix(np.linalg.norm(points[:, None] - points[None], axis=2)))
+    start = rng.permutation(60)
+    tour = local_search(distances, start)
+    assert sorted(tour.tolist()) == list(range(60))
+    assert tour_length(distances, tour) < tour_length(distances, start) / 3
+    assert two_opt_move(distances, tour)[0] <= 1e-9
+    assert or_opt_move(distances, tour)[0] <= 1e-9
+
+
+def test_move_gains_match_tour_lengths():
+    rng = np.random.default_rng(1)
+    matrix = rng.integers(1, 100, size=(10, 10))
+    np.fill_diagonal(matrix, 0)
+    distances = distance_matrix(AdjacencyMatrix(matrix))
+    tour = rng.permutation(10)
+    gain, i, j = two_opt_move(distances, tour)
+    moved = tour.copy()
+    moved[i + 1:j + 1] = moved[i + 1:j + 1][::-1]
+    assert tour_length(distances, tour) - tour_length(distances, moved) == pytest.approx(gain)
+
+
+def test_ant_colony_time_budget_and_colonies():
+    rng = np.random.default_rng(2)
+    points = rng.random((40, 2))
+    data = AdjacencyMatrix(np.linalg.norm(points[:, None] - points[None], axis=2))
+    tour = AntColony(data, seed=0).finding_way(iterations=10**6, time_budget=0.5)
+    _check_tour(tour, 40)
+    best = AntColony(data, seed=0).finding_way(iterations=5, colonies=2, processes=2)
+    _check_tour(best, 40)
+    assert best.distance == pytest.approx(tour_length(distance_matrix(data), best.vertices[:-1]))
@@ -0,0 +1,220 @@
+import os
+import time
+import numpy as np
+from dataclasses import dataclass
+from multiprocessing import get_context
+from concurrent.futures import ProcessPoolExecutor
+from conversion import to_adjacency_matrix
+
+
+@dataclass
+class Tour:
+    """
+    Замкнутый маршрут коммивояжёра
+
+    Атрибуты:
+        vertices (list) - вершины в порядке обхода, первая повторена в конце (None, если маршрут не найден)
+        distance (float) - длина маршрута (inf, если маршрут не найден)
+    """
+    vertices: list
+    distance: float
+
+
+def distance_matrix(data) -> np.ndarray:
+    """
+    Матрица расстояний для поиска маршрута: вес дуги, а вместо отсутствующих дуг и диагонали —
+    штраф, больший длины любого маршрута из настоящих дуг. Так локальный поиск обходится
+    без inf и nan, а маршрут со штрафной дугой распознаётся по длине.
+    """
+    matrix = to_adjacency_matrix(data).matrix.astype(np.float64)
+    penalty = matrix.sum() + 1
+    distances = np.where(matrix > 0, matrix, penalty)
+    np.fill_diagonal(distances, penalty)
+    return distances
+
+
+def tour_length(distances, tour) -> float:
+    tour = np.asarray(tour)
+    return float(distances[tour, np.roll(tour, -1)].sum())
+
+
+def two_opt_move(distances, tour):
+    """
+    Лучший ход 2-opt: разворот отрезка tour[i + 1 .. j].
+
+    Выигрыши всех пар (i, j) считаются одной матрицей NumPy. Для несимметричных расстояний
+    в выигрыш входит и разница длины развёрнутого отрезка (через префиксные суммы прямых
+    и обратных дуг). Возвращает (выигрыш, i, j); выигрыш <= 0 — улучшений нет.
+    """
+    n = len(tour)
+    # ordered[i, j] — расстояние от i-й до j-й вершины маршрута, следующая вершина — сдвиг на 1
+    ordered = distances[np.ix_(tour, tour)]
+    forward = np.diagonal(np.roll(ordered, -1, axis=1)).copy()
+    backward = np.diagonal(np.roll(ordered, -1, axis=0)).copy()
+    # reversal[i, j] — изменение длины отрезка tour[i + 1 .. j] при развороте
+    prefix = np.concatenate(([0.0], np.cumsum(backward - forward)))
+    reversal = prefix[np.newaxis, :n] - prefix[1:n + 1, np.newaxis]
+
+    gains = forward[:, np.newaxis] + forward[np.newaxis, :] - ordered - np.roll(ordered, (-1, -1), axis=(0, 1))
+    gains -= reversal
+    # допустимы только 0 <= i < j - 1 < n - 1: смежные рёбра и замыкание на себя ничего не меняют
+    gains[np.tril_indices(n, 1)] = -np.inf
+    gains[0, n - 1] = -np.inf
+    best = int(np.argmax(gains))
+    i, j = divmod(best, n)
+    return gains[i, j], i, j
+
+
+def or_opt_move(distances, tour, max_segment=3):
+    """
+    Лучший ход Or-opt: перенос отрезка из 1..max_segment вершин (без разворота) между двумя
+    другими соседними вершинами маршрута. Возвращает (выигрыш, начало, длина, позиция вставки).
+    """
+    n = len(tour)
+    ordered = distances[np.ix_(tour, tour)]
+    positions = np.arange(n)
+    edges = ordered[positions, (positions + 1) % n]
+    # вход в начало отрезка из вершины j: ordered.T[s, j] = ordered[j, s]
+    entering = ordered.T
+    best = (-np.inf, 0, 0, 0)
+    for length in range(1, min(max_segment, n - 3) + 1):
+        last = (positions + length - 1) % n
+        before = (positions - 1) % n
+        following = (positions + length) % n
+        # выигрыш от того, что отрезок вынут и его соседи соединены напрямую
+        removed = ordered[before, positions] + ordered[last, following] - ordered[before, following]
+        # цена вставки отрезка s.. между j-й и (j + 1)-й вершинами
+        leaving = np.roll(ordered[last], -1, axis=1)
+        gains = removed[:, np.newaxis] - (entering + leaving - edges[np.newaxis, :])
+        # нельзя вставлять внутрь самого отрезка и на его прежнее место
+        gains[np.repeat(positions, length + 1), ((positions[:, np.newaxis] + np.arange(-1, length)) % n).ravel()] = -np.inf
+        position = int(np.argmax(gains))
+        start, target = divmod(position, n)
+        if gains[start, target] > best[0]:
+            best = (gains[start, target], start, length, target)
+    return best
+
+
+def local_search(distances, tour, deadline=None, tolerance=1e-9) -> np.ndarray:
+    """Улучшает маршрут ходами 2-opt, а когда они кончаются, — ходами Or-opt, пока есть выигрыш и время."""
+    tour = np.asarray(tour, dtype=np.int64).copy()
+    if len(tour) < 4:
+        return tour
+    while deadline is None or time.perf_counter() < deadline:
+        gain, i, j = two_opt_move(distances, tour)
+        if gain > tolerance:
+            tour[i + 1:j + 1] = tour[i + 1:j + 1][::-1]
+            continue
+        gain, start, length, target = or_opt_move(distances, tour)
+        if gain <= tolerance:
+            break
+        # поворачиваем маршрут так, чтобы отрезок оказался в начале, и вставляем его после target
+        tour = np.roll(tour, -start)
+        target = (target - start) % len(tour)
+        segment, rest = tour[:length], tour[length:]
+        position = target - length + 1
+        tour = np.concatenate((rest[:position], segment, rest[position:]))
+    return tour
+
+
+class AntColony():
+    """
+    Муравьиный алгоритм поиска маршрута коммивояжёра
+
+    Все муравьи колонии строят маршруты одновременно: на каждом шаге для всех муравьёв сразу
+    берутся строки матрицы привлекательности pheromone^alpha * (1 / d)^beta, посещённые вершины
+    обнуляются маской, следующая вершина выбирается по накопленным суммам. Испарение и отложение
+    феромона — матричные операции (np.add.at по дугам всех маршрутов итерации и лучшего маршрута).
+    Лучший маршрут итерации улучшается локальным поиском 2-opt / Or-opt на заранее посчитанной
+    матрице расстояний. Поиск ограничен числом итераций и, по желанию, временем time_budget в секундах.
+    При colonies > 1 независимые колонии с разными зёрнами работают в пуле процессов, возвращается
+    лучший маршрут.
+    """
+    def __init__(self, data, ants=None, alpha=1.0, beta=3.0, evaporation=0.5, local_search=True, seed=None):
+        self.data = data
+        self.ants = ants
+        self.alpha = alpha
+        self.beta = beta
+        self.evaporation = evaporation
+        self.local_search = local_search
+        self.seed = seed
+
+    def finding_way(self, data=None, iterations=100, time_budget=None, colonies=1, processes=None) -> Tour:
+        if data is not None:
+            self.data = data
+        distances = distance_matrix(self.data)
+        seeds = np.random.SeedSequence(self.seed).spawn(colonies)
+        options = dict(ants=self.ants, alpha=self.alpha, beta=self.beta, evaporation=self.evaporation,
+                       local_search=self.local_search, iterations=iterations, time_budget=time_budget)
+        if colonies == 1:
+            results = [_run_colony(distances, seeds[0], options)]
+        else:
+            processes = min(colonies, processes or os.cpu_count() or 1)
+            with ProcessPoolExecutor(processes, mp_context=get_context("spawn")) as pool:
+                results = list(pool.map(_run_colony, [distances] * colonies, seeds, [options] * colonies))
+
+        tour, length = min(results, key=lambda result: result[1])
+        if tour is None or length >= distances[0, 0]:
+            return Tour(None, float("inf"))
+        # маршрут начинается и заканчивается в вершине 0
+        tour = np.roll(tour, -int(np.argmin(tour))).tolist()
+        return Tour(tour + tour[:1], length)
+
+
+def _run_colony(distances, seed, options):
+    rng = np.random.default_rng(seed)
+    deadline = None if options["time_budget"] is None else time.perf_counter() + options["time_budget"]
+    n = len(distances)
+    if n == 1:
+        return np.zeros(1, dtype=np.int64), 0.0
+    penalty = distances[0, 0]
+    ants = options["ants"] or min(n, 32)
+    visibility = np.where(distances < penalty, 1.0 / distances, 0.0) ** options["beta"]
+    pheromone = np.ones((n, n))
+    best_tour, best_length = None, np.inf
+
+    for _ in range(options["iterations"]):
+        if deadline is not None and time.perf_counter() >= deadline:
+            break
+        attractiveness = pheromone ** options["alpha"] * visibility
+        tours = _construct_tours(attractiveness, ants, rng)
+        lengths = distances[tours, np.roll(tours, -1, axis=1)].sum(axis=1)
+
+        leader = int(np.argmin(lengths))
+        tour = tours[leader]
+        if options["local_search"]:
+            tour = local_search(distances, tour, deadline)
+        length = tour_length(distances, tour)
+        if length < best_length:
+            best_tour, best_length = tour, length
+
+        # испарение и отложение феромона обратно пропорционально длине маршрута (лучший получает 1)
+        pheromone *= 1 - options["evaporation"]
+        valid = lengths < penalty
+        deposit_tours = np.vstack((tours[valid], best_tour[np.newaxis]))
+        deposit = best_length / np.concatenate((lengths[valid], [best_length]))
+        np.add.at(pheromone, (deposit_tours, np.roll(deposit_tours, -1, axis=1)),
+                  np.repeat(deposit[:, np.newaxis], n, axis=1))
+    return best_tour, best_length
+
+
+def _construct_tours(attractiveness, ants, rng) -> np.ndarray:
+    n = len(attractiveness)
+    tours = np.empty((ants, n), dtype=np.int64)
+    tours[:, 0] = rng.integers(0, n, size=ants)
+    allowed = np.ones((ants, n), dtype=bool)
+    rows = np.arange(ants)
+    allowed[rows, tours[:, 0]] = False
+    for step in range(1, n):
+        weights = attractiveness[tours[:, step - 1]] * allowed
+        totals = np.cumsum(weights, axis=1)
+        # тупик (все разрешённые соседи недостижимы) — идём в любую непосещённую вершину,
+        # такой маршрут получит штрафную длину
+        stuck = totals[:, -1] <= 0
+        if stuck.any():
+            totals[stuck] = np.cumsum(allowed[stuck], axis=1)
+        threshold = rng.random(ants) * totals[:, -1]
+        choice = np.minimum((totals <= threshold[:, np.newaxis]).sum(axis=1), n - 1)
+        tours[:, step] = choice
+        allowed[rows, choice] = False
+    return tours
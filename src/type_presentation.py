@@ -1,6 +1,7 @@
 import numpy as np
 from typing import List, Tuple
-from dataclasses import dataclass
+from itertools import chain
+from dataclasses import dataclass, field
 
 @dataclass
 class Graph:
@@ -16,6 +17,9 @@ class Graph:
     def nodes(self):
         pass
 
+    def number_of_nodes(self):
+        pass
+
     def connections(self, index):
         pass
     
@@ -26,6 +30,36 @@ class Graph:
     def shape(self):
         pass
 
+    def add_node(self):
+        pass
+
+    def add_edge(self, i, j, weight=1):
+        pass
+
+    def remove_edge(self, i, j):
+        pass
+
+    def add_edges(self, sources, targets, weights=None):
+        pass
+
+    def remove_edges(self, sources, targets):
+        pass
+
+    @property
+    def version(self) -> int:
+        """Номер версии графа, увеличивается при каждом изменении графа через его методы"""
+        return getattr(self, "_version", 0)
+
+    def _touch(self):
+        self._version = self.version + 1
+
+
+def _is_buffer_view(matrix, buffer) -> bool:
+    """matrix по-прежнему левый верхний угол буфера роста, а не подменённый снаружи массив."""
+    return (buffer is not None and isinstance(matrix, np.ndarray) and matrix.dtype == buffer.dtype
+            and matrix.strides == buffer.strides
+            and matrix.__array_interface__["data"][0] == buffer.__array_interface__["data"][0])
+
 @dataclass
 class AdjacencyMatrix(Graph):
     """
@@ -46,10 +80,14 @@ class AdjacencyMatrix(Graph):
             0 — дуги между вершинами нет
             N — есть дуга (ориентированное ребро), которая направлена из вершины i в вершину j, и её вес равен N
 
+    Вершины добавляются с амортизированным ростом: матрица лежит в буфере с запасом, ёмкость которого
+    удваивается при заполнении, а matrix — представление его левого верхнего угла.
+
     Атрибуты:
         matrix (np.ndarray) - матрица смежности
     """
     matrix: np.ndarray
+    _buffer: np.ndarray = field(default=None, init=False, repr=False)
 
     def __getitem__(self, index):
         return self.matrix[index]
@@ -63,6 +101,9 @@ class AdjacencyMatrix(Graph):
     def nodes(self) -> list:
         return list(range(self.matrix.shape[0])) 
 
+    def number_of_nodes(self) -> int:
+        return max(self.matrix.shape)
+
     def connections(self, index):
         return np.nonzero(self.matrix[index])[0]
     
@@ -74,6 +115,33 @@ class AdjacencyMatrix(Graph):
         """Возвращает размеры матрицы смежности (число вершин, число вершин)"""
         return self.matrix.shape
 
+    def add_node(self) -> int:
+        size = len(self.matrix)
+        if size == len(self._buffer if self._buffer is not None else ()) or not _is_buffer_view(self.matrix, self._buffer):
+            matrix = np.asarray(self.matrix)
+            buffer = np.zeros((max(2 * size, 1),) * 2, dtype=matrix.dtype)
+            buffer[:size, :size] = matrix
+            self._buffer = buffer
+        self.matrix = self._buffer[:size + 1, :size + 1]
+        self._touch()
+        return size
+
+    def add_edge(self, i, j, weight=1):
+        self.matrix[i, j] = weight
+        self._touch()
+
+    def remove_edge(self, i, j):
+        self.matrix[i, j] = 0
+        self._touch()
+
+    def add_edges(self, sources, targets, weights=None):
+        self.matrix[np.asarray(sources), np.asarray(targets)] = 1 if weights is None else np.asarray(weights)
+        self._touch()
+
+    def remove_edges(self, sources, targets):
+        self.matrix[np.asarray(sources), np.asarray(targets)] = 0
+        self._touch()
+
 @dataclass
 class IncidenceMatrix(Graph):
     """
@@ -86,10 +154,22 @@ class IncidenceMatrix(Graph):
     В ориентированном графе если ребро выходит из вершины, то соответствующий элемент равен 1; если ребро входит в вершину,
     то соответствующий элемент равен -1; если ребро отсутствует, то элемент равен 0.
 
+    При создании матрица один раз раскладывается по столбцам на дуги (источник, приёмник, вес),
+    которые сортируются по источнику в CSR-индекс. Поэтому connections() работает за O(степени),
+    а weight() — двоичным поиском внутри строки, без просмотра всей матрицы.
+    Индекс не следит за изменениями matrix на месте, только за изменениями через add_*/remove_*.
+    Для них матрица лежит в буфере с запасом по строкам и столбцам, ёмкость удваивается при заполнении;
+    удалённый столбец заменяется последним, поэтому порядок столбцов может меняться.
+
     Атрибуты:
         matrix (np.ndarray) - матрица инцидентности
     """
     matrix: np.ndarray
+    _index: "CompressedSparseRow" = field(default=None, init=False, repr=False)
+    _buffer: np.ndarray = field(default=None, init=False, repr=False)
+
+    def __post_init__(self):
+        self._init_index()
 
     def __getitem__(self, index):
         return self.matrix[index]
@@ -100,27 +180,171 @@ class IncidenceMatrix(Graph):
     def nodes(self):
         return list(range(self.matrix.shape[0])) 
 
+    def number_of_nodes(self) -> int:
+        return self.matrix.shape[0]
+
     def connections(self, index):
-        # надо улучшить, много лишних операций
-        outgoing_edges = np.where((self.matrix[index] != 0) & (self.matrix[index] != -1))[0]
-        indexes = np.where((self.matrix[:, outgoing_edges] != 0))[0]
-        unique_indexes = np.unique(indexes[indexes != index])
-        return unique_indexes
+        return self._index.connections(index)
     
     def weight(self, i, j):
-        outgoing_edges1 = np.where(self.matrix[i] != 0)[0]
-        outgoing_edges2 = np.where(self.matrix[j] != 0)[0]
-        # фигня костыльная магическая еще и в 1d
-        common_edges = np.intersect1d(outgoing_edges1, outgoing_edges2)
-        ij_weight = self.matrix[i, common_edges[0]]
-        ji_weight = self.matrix[j, common_edges[0]]
-        return ij_weight if ij_weight > 0 else ji_weight
+        ij_weight = self._index.weight(i, j)
+        return ij_weight if ij_weight > 0 else self._index.weight(j, i)
 
     @property
     def shape(self):
         """Возвращает размеры матрицы смежности (число вершин, число вершин)"""
         return self.matrix.shape
 
+    def add_node(self) -> int:
+        rows, columns = self.matrix.shape
+        self._reserve(rows + 1, columns)
+        self.matrix = self._buffer[:rows + 1, :columns]
+        self._index.add_node()
+        self._touch()
+        return rows
+
+    def add_edge(self, i, j, weight=1, directed=True):
+        """Добавляет столбец-дугу i -> j (при directed=False — неориентированное ребро)."""
+        self.add_edges(np.array([i]), np.array([j]), np.array([weight]), directed)
+
+    def remove_edge(self, i, j):
+        """Удаляет все столбцы с дугой i -> j (неориентированное ребро i — j удаляется целиком)."""
+        self.remove_edges(np.array([i]), np.array([j]))
+
+    def add_edges(self, sources, targets, weights=None, directed=True):
+        sources, targets = np.asarray(sources, dtype=np.int64), np.asarray(targets, dtype=np.int64)
+        weights = np.ones(len(sources), dtype=self.matrix.dtype) if weights is None else np.asarray(weights)
+        self._append_columns(sources, targets, weights, directed)
+        if not directed:
+            sources, targets = np.concatenate((sources, targets)), np.concatenate((targets, sources))
+            weights = np.concatenate((weights, weights))
+        # в индексе остаётся самый левый столбец: уже существующие дуги и повторы внутри пачки не меняются
+        keys = sources * len(self._index) + targets
+        first = np.sort(np.unique(keys, return_index=True)[1])
+        new = [position for position, source, target in zip(first.tolist(), sources[first].tolist(),
+                                                            targets[first].tolist())
+               if source != target and not self._index.has_edge(source, target)]
+        self._index.add_edges(sources[new], targets[new], weights[new])
+        self._touch()
+
+    def remove_edges(self, sources, targets):
+        """Удаляет все столбцы с дугами пачки; просматриваются только строки их вершин."""
+        sources, targets = np.asarray(sources, dtype=np.int64), np.asarray(targets, dtype=np.int64)
+        columns = [self._arc_columns(i, j) for i, j in zip(sources.tolist(), targets.tolist())]
+        columns = np.unique(np.concatenate(columns)) if columns else np.zeros(0, dtype=np.int64)
+        hyperedges = (np.count_nonzero(self.matrix[:, columns], axis=0) > 2).any()
+        self._remove_columns(columns)
+        if hyperedges:
+            # столбец гиперребра давал дуги и к другим вершинам, их проще пересобрать
+            self._init_index()
+        else:
+            # удалённый столбец мог нести и обратную дугу (неориентированное ребро), а параллельный
+            # оставшийся столбец — ту же дугу; индекс сверяется с оставшимися столбцами
+            pairs = sources != targets
+            for i, j in zip(np.concatenate((sources[pairs], targets[pairs])).tolist(),
+                            np.concatenate((targets[pairs], sources[pairs])).tolist()):
+                remaining = self._arc_columns(i, j)
+                if len(remaining):
+                    self._index.add_edge(i, j, self.matrix[i, remaining.min()])
+                else:
+                    self._index.remove_edge(i, j)
+        self._touch()
+
+    def _arc_columns(self, i, j) -> np.ndarray:
+        """Столбцы с дугой i -> j, как их разбирает _incidence_arcs (при i == j — петли при i)."""
+        columns = np.nonzero(self.matrix[i] > 0)[0]
+        if i == j:
+            return columns[np.count_nonzero(self.matrix[:, columns], axis=0) == 1]
+        return columns[self.matrix[j, columns] != 0]
+
+    def _remove_columns(self, columns):
+        # удалённый столбец заменяется последним: O(V) на столбец без сдвига остальных
+        rows, count = self.matrix.shape
+        self._reserve(rows, count)
+        for column in sorted(columns.tolist(), reverse=True):
+            count -= 1
+            self._buffer[:rows, column] = self._buffer[:rows, count]
+            self._buffer[:rows, count] = 0
+        self.matrix = self._buffer[:rows, :count]
+
+    def _append_columns(self, sources, targets, weights, directed):
+        rows, columns = self.matrix.shape
+        self._reserve(rows, columns + len(sources))
+        new_columns = np.arange(columns, columns + len(sources))
+        self._buffer[targets, new_columns] = -1 if directed else weights
+        # вес у источника записываем последним, чтобы петля не затёрлась отметкой входа
+        self._buffer[sources, new_columns] = weights
+        self.matrix = self._buffer[:rows, :columns + len(sources)]
+
+    def _reserve(self, rows, columns):
+        """Гарантирует буфер не меньше rows x columns, удваивая ёмкость при нехватке."""
+        matrix = np.asarray(self.matrix)
+        valid = _is_buffer_view(self.matrix, self._buffer)
+        capacity = self._buffer.shape if valid else matrix.shape
+        if valid and rows <= capacity[0] and columns <= capacity[1]:
+            return
+        shape = tuple(max(needed, 2 * current) if needed > current else current
+                      for needed, current in zip((rows, columns), capacity))
+        buffer = np.zeros(shape, dtype=matrix.dtype)
+        buffer[:matrix.shape[0], :matrix.shape[1]] = matrix
+        self._buffer = buffer
+
+    def _init_index(self):
+        sources, targets, weights, columns = _incidence_arcs(self.matrix)
+        # петли и повторные рёбра между одной парой вершин соседями не считаются, берём самый левый столбец
+        loops = sources != targets
+        sources, targets, weights, columns = sources[loops], targets[loops], weights[loops], columns[loops]
+        order = np.lexsort((columns, targets, sources))
+        sources, targets, weights = sources[order], targets[order], weights[order]
+        first = np.ones(len(sources), dtype=bool)
+        first[1:] = (sources[1:] != sources[:-1]) | (targets[1:] != targets[:-1])
+        self._index = CompressedSparseRow.from_edges(sources[first], targets[first], weights[first],
+                                                     num_nodes=self.matrix.shape[0])
+
+
+def _incidence_arcs(matrix: np.ndarray):
+    """
+    Раскладывает матрицу инцидентности на параллельные массивы дуг (источник, приёмник, вес, столбец).
+
+    Положительное значение в столбце — конец, из которого ребро выходит, его вес; отрицательное — конец,
+    в который дуга входит. Столбец с двумя положительными значениями — неориентированное ребро (две дуги),
+    с одним положительным и одним отрицательным — дуга, с единственным положительным значением — петля.
+    Если в столбце больше двух вершин, каждая положительная вершина соединяется со всеми остальными.
+    """
+    columns, rows = np.nonzero(matrix.T)
+    values = matrix[rows, columns]
+    counts = np.bincount(columns, minlength=matrix.shape[1])
+    starts = np.zeros(matrix.shape[1] + 1, dtype=np.int64)
+    np.cumsum(counts, out=starts[1:])
+
+    # петли: в столбце один ненулевой элемент
+    loops = np.nonzero(counts == 1)[0]
+    loops = loops[values[starts[loops]] > 0]
+    loop_rows = rows[starts[loops]]
+
+    # обычные рёбра: в столбце ровно два ненулевых элемента
+    pairs = np.nonzero(counts == 2)[0]
+    first, second = starts[pairs], starts[pairs] + 1
+    forward = values[first] > 0
+    backward = values[second] > 0
+
+    # гиперрёбра (больше двух вершин в столбце) встречаются редко, разбираем их поштучно
+    extra = ([], [], [], [])
+    for column in np.nonzero(counts > 2)[0]:
+        column_rows = rows[starts[column]:starts[column + 1]]
+        column_values = values[starts[column]:starts[column + 1]]
+        for source, value in zip(column_rows[column_values > 0], column_values[column_values > 0]):
+            for target in column_rows[column_rows != source]:
+                for part, item in zip(extra, (source, target, value, column)):
+                    part.append(item)
+
+    sources = np.concatenate((loop_rows, rows[first[forward]], rows[second[backward]], extra[0])).astype(np.int64)
+    targets = np.concatenate((loop_rows, rows[second[forward]], rows[first[backward]], extra[1])).astype(np.int64)
+    weights = np.concatenate((values[starts[loops]], values[first[forward]], values[second[backward]],
+                              np.array(extra[2], dtype=matrix.dtype)))
+    edge_columns = np.concatenate((loops, pairs[forward], pairs[backward], extra[3])).astype(np.int64)
+    return sources, targets, weights, edge_columns
+
 
 @dataclass
 class AdjacencyList(Graph):
@@ -131,28 +355,52 @@ class AdjacencyList(Graph):
     Каждой вершине графа соответствует список, состоящий из «соседей» (т. е. из вершин, которые
     непосредственно достижимы напрямую из текущей вершины) этой вершины с указанием весов рёбер.
 
-    Атрибуты:
+    При compact=True списки кортежей при создании перекладываются в плоские массивы NumPy
+    (смещения вершин, номера соседей, веса — как в CSR) и больше не хранятся: каждое ребро занимает
+    несколько байт вместо двух наборов объектов Python. Соседи внутри вершины сортируются, и weight()
+    ищет вес двоичным поиском. Свойство data в этом режиме собирает списки заново при каждом обращении.
 
+    Атрибуты:
+        data (List[List[Tuple[int, int]]]) - для каждой вершины список пар (сосед, вес)
+        compact (bool) - хранить ли список в плоских массивах
     """
     _data : List[List[Tuple[int, int]]]
     _data_only_indexes : List[List[int]] = None
+    compact: bool = False
+    _compact: "CompressedSparseRow" = field(default=None, init=False, repr=False)
 
     def __post_init__(self):
-        self._init_data_only_indexes()
+        if self.compact:
+            self._init_compact()
+        else:
+            self._init_data_only_indexes()
 
     def __getitem__(self, index):
+        if self._compact is not None:
+            targets, weights = self._compact._row(index)
+            return list(zip(targets.tolist(), weights.tolist()))
         return self.data[index]
 
     def __len__(self):
+        if self._compact is not None:
+            return len(self._compact)
         return len(self.data)  
     
     def nodes(self):
+        if self._compact is not None:
+            self._compact.flush()
+            return np.unique(self._compact.indices).tolist()
         nodes = set()
         for neighbors in self.data:
             nodes.update(neighbor[0] for neighbor in neighbors)  # Извлекаем первый элемент из каждого кортежа
         return list(nodes) 
 
+    def number_of_nodes(self) -> int:
+        return len(self)
+
     def connections(self, index):
+        if self._compact is not None:
+            return self._compact.connections(index)
         return self._data_only_indexes[index]
     
     def weight(self, i, j):
@@ -169,21 +417,99 @@ class AdjacencyList(Graph):
         """Возвращает размеры матрицы смежности (число вершин, число вершин)"""
         return self.__len__
 
+    def add_node(self) -> int:
+        if self._compact is not None:
+            index = self._compact.add_node()
+        else:
+            self._data.append([])
+            self._data_only_indexes.append([])
+            index = len(self._data) - 1
+        self._touch()
+        return index
+
+    def add_edge(self, i, j, weight=1):
+        """Задаёт вес дуги i -> j (создаёт её, если её не было)."""
+        if self._compact is not None:
+            self._compact.add_edge(i, j, weight)
+        else:
+            self._set_edge(i, j, weight)
+        self._touch()
+
+    def remove_edge(self, i, j):
+        if self._compact is not None:
+            self._compact.remove_edge(i, j)
+        else:
+            self._delete_edge(i, j)
+        self._touch()
+
+    def add_edges(self, sources, targets, weights=None):
+        if weights is None:
+            weights = np.ones(len(sources), dtype=np.int64)
+        if self._compact is not None:
+            self._compact.add_edges(sources, targets, weights)
+        else:
+            for i, j, weight in zip(np.asarray(sources).tolist(), np.asarray(targets).tolist(),
+                                    np.asarray(weights).tolist()):
+                self._set_edge(i, j, weight)
+        self._touch()
+
+    def remove_edges(self, sources, targets):
+        if self._compact is not None:
+            self._compact.remove_edges(sources, targets)
+        else:
+            for i, j in zip(np.asarray(sources).tolist(), np.asarray(targets).tolist()):
+                self._delete_edge(i, j)
+        self._touch()
+
     @property
     def data(self) -> List[List[Tuple[int, int]]]:
+        if self._compact is not None:
+            return [self[index] for index in range(len(self._compact))]
         return self._data
 
     @data.setter
     def data(self, data: List[List[Tuple[int, int]]]):
         self._data = data
-        print(self._data)
-        self._init_data_only_indexes()
+        if self.compact:
+            self._init_compact()
+        else:
+            self._init_data_only_indexes()
+        self._touch()
 
     def _init_data_only_indexes(self):
         self._data_only_indexes = [[neighbor[0] for neighbor in neighbors] for neighbors in self.data]
 
+    def _init_compact(self):
+        lengths = np.fromiter((len(neighbors) for neighbors in self._data), dtype=np.int64, count=len(self._data))
+        pairs = np.array(list(chain.from_iterable(self._data))).reshape(-1, 2)
+        sources = np.repeat(np.arange(len(lengths)), lengths)
+        self._compact = CompressedSparseRow.from_edges(sources, pairs[:, 0].astype(np.int64), pairs[:, 1],
+                                                       num_nodes=len(lengths))
+        # списки больше не нужны, всё хранится в плоских массивах
+        self._data = None
+        self._data_only_indexes = None
+
+    def _set_edge(self, i, j, weight):
+        if not 0 <= j < len(self._data):
+            raise IndexError("vertex index out of range, add it with add_node first")
+        for position, neighbor in enumerate(self._data[i]):
+            if neighbor[0] == j:
+                self._data[i][position] = (j, weight)
+                return
+        self._data[i].append((j, weight))
+        self._data_only_indexes[i].append(j)
+
+    def _delete_edge(self, i, j):
+        neighbors = self._data[i]
+        if any(neighbor[0] == j for neighbor in neighbors):
+            self._data[i] = [neighbor for neighbor in neighbors if neighbor[0] != j]
+            self._data_only_indexes[i] = [neighbor[0] for neighbor in self._data[i]]
+
     def _find_edge_weight(self, node1: int, node2: int):
         """Найти вес ребра между двумя узлами."""
+        if self._compact is not None:
+            weights = self._compact._arc_weights(node1, node2)
+            return weights[0] if len(weights) else None
         for neighbor in self.data[node1]:
             if neighbor[0] == node2:
                 return neighbor[1]
@@ -197,8 +523,31 @@ class EdgeList(Graph):
 
     Список рёбер — таблица (матрица размерностью Nx3), в каждой строке которой записаны две смежные
     вершины и вес, соединяющего их ребра.
+
+    При indexed=True (по умолчанию) при создании один раз строится индекс, отсортированный по источнику
+    (CSR из смещений, приёмников и весов). С ним connections() работает за O(степени), а weight() —
+    за O(log степени) вместо полного просмотра таблицы. Индекс не следит за изменениями matrix на месте,
+    только за изменениями через add_*/remove_*, и обновляется по ним без перестройки.
+    Новые строки дописываются в буфер с удвоением ёмкости. Строки существующих дуг (замена веса,
+    удаление) ищутся одним векторным проходом по столбцу источников, и только если индекс говорит,
+    что такие дуги есть; удалённую строку заменяет последняя, поэтому порядок строк может меняться.
+    Повторяющиеся строки одной дуги остаются, пока дугу не изменят: add_edge оставляет одну строку,
+    remove_edge удаляет все.
+
+    Атрибуты:
+        matrix (np.ndarray) - таблица рёбер (источник, приёмник, вес)
+        indexed (bool) - строить ли индекс по источнику
     """
     matrix: np.ndarray
+    indexed: bool = True
+    _index: "CompressedSparseRow" = field(default=None, init=False, repr=False)
+    _buffer: np.ndarray = field(default=None, init=False, repr=False)
+    # вершины, добавленные add_node без индекса: по строкам таблицы их не видно
+    _num_nodes: int = field(default=0, init=False, repr=False)
+
+    def __post_init__(self):
+        if self.indexed:
+            self._init_index()
 
     def __getitem__(self, index):
         return self.matrix[index]
@@ -210,18 +559,31 @@ class EdgeList(Graph):
         return iter(self.matrix)
     
     def nodes(self) -> list:
-        nodes = set()
-        for i, j, weight in self.data:
-            nodes.update(i)
-            nodes.update(j)
-        return list(nodes)
+        return np.unique(self.matrix[:, :2]).tolist()
+
+    def number_of_nodes(self) -> int:
+        if self._index is not None:
+            return len(self._index)
+        if len(self.matrix) == 0:
+            return self._num_nodes
+        return max(int(self.matrix[:, :2].max()) + 1, self._num_nodes)
 
     def connections(self, index):
+        if self._index is not None:
+            if not 0 <= index < len(self._index):
+                return self._index.indices[:0]
+            return self._index.connections(index)
         rows = np.where(self.matrix[:, 0] == index)[0]
         return self.matrix[rows, 1]
 
     
     def weight(self, i, j):
+        if self._index is not None:
+            # веса дуг в обе стороны, как и при полном просмотре таблицы
+            weights = self._index._arc_weights(i, j)
+            if i == j:
+                return weights
+            return np.concatenate((weights, self._index._arc_weights(j, i)))
         сondition = (((self.matrix[:, 0] == i) & (self.matrix[:, 1] == j)) | 
             ((self.matrix[:, 0] == j) & (self.matrix[:, 1] == i)))
         weights = self.matrix[сondition][:, 2]  # Третий столбец (вес)
@@ -231,3 +593,342 @@ class EdgeList(Graph):
     def shape(self):
         """Возвращает размеры матрицы смежности (число вершин, число вершин)"""
         return self.matrix.shape
+
+    def add_node(self) -> int:
+        """Новая вершина без рёбер."""
+        index = self.number_of_nodes()
+        if self._index is not None:
+            self._index.add_node()
+        self._num_nodes = index + 1
+        self._touch()
+        return index
+
+    def add_edge(self, i, j, weight=1):
+        """Задаёт вес дуги i -> j; новая дуга дописывается в конец таблицы."""
+        self._as_table()
+        exists = self._index is None or self._index.has_edge(i, j)
+        if exists:
+            rows = np.nonzero((self.matrix[:, 0] == i) & (self.matrix[:, 1] == j))[0]
+            exists = len(rows) > 0
+            self.matrix[rows[:1], 2] = weight
+            # повторы дуги схлопываются в одну строку, как и в индексе
+            self._remove_rows(rows[1:])
+        if not exists:
+            self._append_rows(np.array([[i, j, weight]]))
+        if self._index is not None:
+            self._grow_index(max(i, j) + 1)
+            self._index.add_edge(i, j, weight)
+        self._touch()
+
+    def remove_edge(self, i, j):
+        self.remove_edges(np.array([i]), np.array([j]))
+
+    def add_edges(self, sources, targets, weights=None):
+        """Задаёт веса дуг пачкой; среди повторов в пачке побеждает последний."""
+        self._as_table()
+        sources, targets = np.asarray(sources, dtype=np.int64), np.asarray(targets, dtype=np.int64)
+        weights = np.ones(len(sources), dtype=self.matrix.dtype) if weights is None else np.asarray(weights)
+        base = max(self.number_of_nodes(), int(sources.max(initial=-1)) + 1, int(targets.max(initial=-1)) + 1)
+        keys = sources * base + targets
+        last = len(keys) - 1 - np.unique(keys[::-1], return_index=True)[1]
+        sources, targets, weights = sources[last], targets[last], weights[last]
+
+        if self._index is not None:
+            self._grow_index(base)
+            exists = self._indexed(sources, targets)
+        else:
+            exists = np.ones(len(sources), dtype=bool)
+        rows, found = self._find_rows(sources[exists], targets[exists])
+        # из повторов дуги в таблице остаётся первая строка, как и в индексе
+        found, first = np.unique(found, return_index=True)
+        rows, duplicates = rows[first], np.delete(rows, first)
+        updated = np.nonzero(exists)[0][found]
+        if len(rows):
+            self.matrix[rows, 2] = weights[updated]
+            self._remove_rows(duplicates)
+        new = np.ones(len(sources), dtype=bool)
+        new[updated] = False
+        self._append_rows(np.column_stack((sources[new], targets[new], weights[new])))
+        if self._index is not None:
+            self._index.add_edges(sources, targets, weights)
+        self._touch()
+
+    def remove_edges(self, sources, targets):
+        self._as_table()
+        sources, targets = np.asarray(sources, dtype=np.int64), np.asarray(targets, dtype=np.int64)
+        if self._index is not None:
+            inside = (sources >= 0) & (targets >= 0) & (sources < len(self._index)) & (targets < len(self._index))
+            sources, targets = sources[inside], targets[inside]
+            present = self._indexed(sources, targets)
+            sources, targets = sources[present], targets[present]
+            self._index.remove_edges(sources, targets)
+        if len(sources):
+            self._remove_rows(self._find_rows(sources, targets)[0])
+        self._touch()
+
+    def _indexed(self, sources, targets) -> np.ndarray:
+        """Какие дуги пачки уже есть в индексе: O(log степени) на дугу."""
+        return np.fromiter((self._index.has_edge(i, j) for i, j in zip(sources.tolist(), targets.tolist())),
+                           dtype=bool, count=len(sources))
+
+    def _find_rows(self, sources, targets):
+        """Строки таблицы с дугами пачки и номер дуги пачки для каждой строки (один проход по источникам)."""
+        if not len(sources) or not len(self.matrix):
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        rows = np.nonzero(np.isin(self.matrix[:, 0], sources))[0]
+        base = max(int(self.matrix[rows, 1].max(initial=-1)), int(targets.max())) + 1
+        keys = sources * base + targets
+        order = np.argsort(keys)
+        row_keys = self.matrix[rows, 0].astype(np.int64) * base + self.matrix[rows, 1].astype(np.int64)
+        positions = np.searchsorted(keys[order], row_keys).clip(max=len(keys) - 1)
+        matched = keys[order][positions] == row_keys
+        return rows[matched], order[positions[matched]]
+
+    def _as_table(self):
+        # matrix могли заменить списком или пустым массивом — изменения идут по таблице Nx3
+        if not isinstance(self.matrix, np.ndarray) or self.matrix.ndim != 2:
+            self.matrix = np.asarray(self.matrix).reshape(-1, 3)
+
+    def _reserve(self, needed, dtype=None):
+        """Буфер строк не меньше needed, удваивая ёмкость; подменённый снаружи matrix копируется заново."""
+        matrix = self.matrix
+        dtype = matrix.dtype if dtype is None else np.result_type(matrix.dtype, dtype)
+        if (not _is_buffer_view(matrix, self._buffer) or needed > len(self._buffer)
+                or dtype != self._buffer.dtype):
+            buffer = np.empty((max(needed, 2 * len(matrix)), 3), dtype=dtype)
+            buffer[:len(matrix)] = matrix
+            self._buffer = buffer
+        return self._buffer
+
+    def _append_rows(self, rows):
+        size = len(self.matrix)
+        needed = size + len(rows)
+        buffer = self._reserve(needed, rows.dtype)
+        buffer[size:needed] = rows
+        self.matrix = buffer[:needed]
+
+    def _remove_rows(self, rows):
+        # на место удалённых строк переносятся последние строки таблицы: O(удалённых) после поиска
+        rows = np.unique(rows)
+        if not len(rows):
+            return
+        size = len(self.matrix)
+        kept = size - len(rows)
+        buffer = self._reserve(size)
+        holes = rows[rows < kept]
+        buffer[holes] = buffer[np.setdiff1d(np.arange(kept, size), rows)]
+        self.matrix = buffer[:kept]
+
+    def _grow_index(self, num_nodes):
+        for _ in range(num_nodes - len(self._index)):
+            self._index.add_node()
+
+    def _init_index(self):
+        matrix = np.asarray(self.matrix).reshape(-1, 3)
+        self._index = CompressedSparseRow.from_edges(matrix[:, 0], matrix[:, 1], matrix[:, 2])
+
+
+@dataclass
+class CompressedSparseRow(Graph):
+    """
+    Сжатое разреженное представление (CSR)
+
+    CSR хранит граф тремя плоскими массивами. Соседи вершины i лежат в indices[indptr[i]:indptr[i + 1]],
+    а веса соответствующих дуг — в weights по тем же позициям. Память O(V + E), выборка соседей — срез
+    без копирования за O(степени), вес дуги — двоичный поиск внутри строки.
+    Внутри каждой строки indices должны быть отсортированы по возрастанию (from_edges это гарантирует).
+
+    Изменения (add_edge, remove_edge, add_node) копятся в буфере по вершинам-источникам: connections()
+    и weight() учитывают его сразу, а в массивы он вливается одним проходом, когда разрастается,
+    или при вызове flush(). Перед прямым чтением indptr/indices/weights после изменений нужен flush()
+    (to_csr делает это сам). Пакетные add_edges/remove_edges пишут в тот же буфер.
+
+    Атрибуты:
+        indptr (np.ndarray) - смещения строк, длина равна числу вершин + 1
+        indices (np.ndarray) - номера соседей, отсортированные внутри каждой строки
+        weights (np.ndarray) - веса дуг, параллельные indices (по умолчанию все равны 1)
+    """
+    indptr: np.ndarray
+    indices: np.ndarray
+    weights: np.ndarray = None
+    # источник -> {приёмник: новый вес или None, если дуга удалена}
+    _delta: dict = field(default_factory=dict, init=False, repr=False)
+    _delta_size: int = field(default=0, init=False, repr=False)
+    _added_nodes: int = field(default=0, init=False, repr=False)
+
+    def __post_init__(self):
+        if self.weights is None:
+            self.weights = np.ones(len(self.indices), dtype=np.int64)
+
+    def __getitem__(self, index):
+        return self.connections(index)
+
+    def __len__(self):
+        return len(self.indptr) - 1 + self._added_nodes
+
+    def __iter__(self):
+        return (self.connections(index) for index in range(len(self)))
+
+    def nodes(self) -> list:
+        return list(range(len(self)))
+
+    def number_of_nodes(self) -> int:
+        return len(self)
+
+    def connections(self, index):
+        if not self._delta and index < len(self.indptr) - 1:
+            return self.indices[self.indptr[index]:self.indptr[index + 1]]
+        return self._row(index)[0]
+
+    def weight(self, i, j):
+        weights = self._arc_weights(i, j)
+        if len(weights):
+            return weights[0]
+        return 0
+
+    def has_edge(self, i, j) -> bool:
+        """Есть ли дуга i -> j (в отличие от weight, различает отсутствие дуги и дугу с весом 0)."""
+        return len(self._arc_weights(i, j)) > 0
+
+    @property
+    def shape(self):
+        """Возвращает размеры эквивалентной матрицы смежности (число вершин, число вершин)"""
+        return (len(self), len(self))
+
+    def add_node(self) -> int:
+        self._added_nodes += 1
+        self._touch()
+        return len(self) - 1
+
+    def add_edge(self, i, j, weight=1):
+        """Задаёт вес дуги i -> j (создаёт её, если её не было)."""
+        self._check_nodes(i, j)
+        self._delta.setdefault(i, {})[j] = weight
+        self._delta_size += 1
+        self._touch()
+        self._maybe_flush()
+
+    def remove_edge(self, i, j):
+        """Удаляет дугу i -> j (все кратные дуги), если она есть."""
+        self._check_nodes(i, j)
+        self._delta.setdefault(i, {})[j] = None
+        self._delta_size += 1
+        self._touch()
+        self._maybe_flush()
+
+    def add_edges(self, sources, targets, weights=None):
+        """Задаёт веса дуг пачкой; среди повторов в пачке побеждает последний."""
+        sources, targets = np.asarray(sources, dtype=np.int64), np.asarray(targets, dtype=np.int64)
+        weights = np.ones(len(sources), dtype=self.weights.dtype) if weights is None else np.asarray(weights)
+        self._check_nodes(sources, targets)
+        self._record(sources, targets, weights.tolist())
+
+    def remove_edges(self, sources, targets):
+        sources, targets = np.asarray(sources, dtype=np.int64), np.asarray(targets, dtype=np.int64)
+        self._check_nodes(sources, targets)
+        self._record(sources, targets, [None] * len(sources))
+
+    def _record(self, sources, targets, weights):
+        """Кладёт пачку изменений в тот же буфер, что и одиночные add_edge/remove_edge: O(размера пачки)."""
+        delta = self._delta
+        for source, target, weight in zip(sources.tolist(), targets.tolist(), weights):
+            changes = delta.get(source)
+            if changes is None:
+                changes = delta[source] = {}
+            changes[target] = weight
+        self._delta_size += len(sources)
+        self._touch()
+        self._maybe_flush()
+
+    def flush(self):
+        """Вливает накопленные изменения в indptr/indices/weights."""
+        if not self._delta and not self._added_nodes:
+            return
+        base_sources, base_targets, base_weights = self._arcs()
+        changed = [(source, target, weight) for source, changes in self._delta.items()
+                   for target, weight in changes.items()]
+        changed_sources = np.array([arc[0] for arc in changed], dtype=np.int64)
+        changed_targets = np.array([arc[1] for arc in changed], dtype=np.int64)
+        added = [arc for arc in changed if arc[2] is not None]
+
+        kept = ~np.isin(base_sources * len(self) + base_targets, changed_sources * len(self) + changed_targets)
+        self._rebuild(np.concatenate((base_sources[kept], np.array([arc[0] for arc in added], dtype=np.int64))),
+                      np.concatenate((base_targets[kept], np.array([arc[1] for arc in added], dtype=np.int64))),
+                      np.concatenate((base_weights[kept], np.array([arc[2] for arc in added])
+                                                                if added else base_weights[:0])))
+
+    def transpose(self) -> "CompressedSparseRow":
+        """CSR обратного графа: каждая дуга i -> j становится дугой j -> i (входящие соседи вершин)."""
+        self.flush()
+        sources = np.repeat(np.arange(len(self)), np.diff(self.indptr))
+        return CompressedSparseRow.from_edges(self.indices, sources, self.weights, num_nodes=len(self))
+
+    def _positions(self, i, j) -> slice:
+        """Срез позиций дуг i -> j в indices/weights (пустой, если дуги нет), двоичный поиск по строке i."""
+        if not (0 <= i < len(self.indptr) - 1 and 0 <= j):
+            return slice(0, 0)
+        start, end = self.indptr[i], self.indptr[i + 1]
+        row = self.indices[start:end]
+        return slice(start + np.searchsorted(row, j, side="left"), start + np.searchsorted(row, j, side="right"))
+
+    def _arc_weights(self, i, j) -> np.ndarray:
+        """Веса всех дуг i -> j с учётом ещё не влитых изменений."""
+        changes = self._delta.get(i)
+        if changes is not None and j in changes:
+            return self.weights[:0] if changes[j] is None else np.array([changes[j]])
+        return self.weights[self._positions(i, j)]
+
+    def _row(self, index):
+        """Соседи и веса вершины index с учётом ещё не влитых изменений."""
+        if index < len(self.indptr) - 1:
+            positions = slice(self.indptr[index], self.indptr[index + 1])
+        else:
+            positions = slice(0, 0)
+        targets, weights = self.indices[positions], self.weights[positions]
+        changes = self._delta.get(index)
+        if not changes:
+            return targets, weights
+        kept = ~np.isin(targets, np.fromiter(changes, dtype=np.int64, count=len(changes)))
+        added = [(target, weight) for target, weight in changes.items() if weight is not None]
+        targets = np.concatenate((targets[kept], np.array([arc[0] for arc in added], dtype=targets.dtype)))
+        weights = np.concatenate((weights[kept], np.array([arc[1] for arc in added]) if added else weights[:0]))
+        order = np.argsort(targets, kind="stable")
+        return targets[order], weights[order]
+
+    def _arcs(self):
+        sources = np.repeat(np.arange(len(self.indptr) - 1), np.diff(self.indptr))
+        return sources, self.indices.astype(np.int64), self.weights
+
+    def _rebuild(self, sources, targets, weights):
+        rebuilt = CompressedSparseRow.from_edges(sources, targets, weights, num_nodes=len(self))
+        self.indptr, self.indices, self.weights = rebuilt.indptr, rebuilt.indices, rebuilt.weights
+        self._delta = {}
+        self._delta_size = 0
+        self._added_nodes = 0
+
+    def _maybe_flush(self):
+        # буфер вливается, когда он сравним с долей графа: стоимость слияния O(V + E) делится на много изменений
+        if self._delta_size > max(1024, len(self.indices) // 8):
+            self.flush()
+
+    def _check_nodes(self, sources, targets):
+        indexes = np.concatenate((np.ravel(sources), np.ravel(targets)))
+        if len(indexes) and (indexes.min() < 0 or indexes.max() >= len(self)):
+            raise IndexError("vertex index out of range, add it with add_node first")
+
+    @classmethod
+    def from_edges(cls, sources, targets, weights=None, num_nodes=None):
+        """Строит CSR из параллельных массивов дуг (источник, приёмник, вес) за один проход сортировки."""
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int64)
+        if weights is None:
+            weights = np.ones(len(sources), dtype=np.int64)
+        weights = np.asarray(weights)
+        if num_nodes is None:
+            num_nodes = int(max(sources.max(initial=-1), targets.max(initial=-1))) + 1
+
+        order = np.lexsort((targets, sources))
+        indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=num_nodes), out=indptr[1:])
+        index_dtype = np.int32 if num_nodes <= np.iinfo(np.int32).max else np.int64
+        return cls(indptr, targets[order].astype(index_dtype), weights[order])
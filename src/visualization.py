@@ -2,6 +2,7 @@ import numpy as np
 import networkx as nx
 import matplotlib.pyplot as plt
 from type_presentation import AdjacencyMatrix, IncidenceMatrix, AdjacencyList, EdgeList
+from conversion import arcs
 
 
 class NetworxGraphVisualizer():
@@ -31,13 +32,10 @@ class NetworxGraphVisualizer():
     def _build_graph(self):
         """Построение графа на основе матрицы смежности."""
 
-        for i in self.data.nodes():
-            if not self.graph.has_node(i):
-                self.graph.add_node(i)
-
-        for i in self.data.nodes():   
-            for j in self.data.connections(index=i):
-                self.graph.add_edge(i, j, weight=self.data.weight(i, j))
+        num_nodes, sources, targets, weights = arcs(self.data)
+        self.graph.add_nodes_from(range(num_nodes))
+        # все дуги добавляем одним пакетом вместо connections()/weight() для каждой вершины
+        self.graph.add_weighted_edges_from(zip(sources.tolist(), targets.tolist(), weights.tolist()))
         # print(self.graph.nodes())
         # print(self.graph.edges(data=True)) 
 
@@ -49,8 +47,12 @@ class NetworxGraphVisualizer():
         # Если layout не задан, используем сохранённый
         if layout is not None:
             self.layout = layout
+        self._draw_static(node_size, font_size, node_color, edge_color)
+        plt.show(block=False)
+        plt.pause(self.plot_sleep)
 
-        # Выбор раскладки для узлов
+    def _compute_layout(self):
+        """Позиции узлов для выбранного layout."""
         if self.layout == 'spring':
             self.pos = nx.spring_layout(self.graph)  # Spring layout
         elif self.layout == 'circular':
@@ -62,6 +64,10 @@ class NetworxGraphVisualizer():
         elif self.layout == 'spectral':
             self.pos = nx.spectral_layout(self.graph)  # Spectral layout
 
+    def _draw_static(self, node_size=500, font_size=12, node_color=None, edge_color=None):
+        """Рисует граф в текущей фигуре (без показа окна)."""
+        self._compute_layout()
+
         # Если цвета узлов или рёбер не заданы, используем стандартные
         if node_color is None:
             node_color = self.node_color
@@ -101,8 +107,6 @@ class NetworxGraphVisualizer():
 
         plt.title(f'Graph Visualization using {self.layout} layout')
         plt.axis('off')  # Отключаем оси
-        plt.show(block=False)
-        plt.pause(self.plot_sleep)
    
     def update_graph(self, path, current_index, path_color="red", index_color="green"):
         """Обновляет визуализацию графа, выделяя текущую вершину и путь."""
@@ -137,6 +141,48 @@ class NetworxGraphVisualizer():
 
         plt.pause(self.plot_sleep)
 
+    def _frame_colors(self, trace, step, path_color="red", index_color="green"):
+        """Цвета узлов на шаге step записи обхода: путь до текущей вершины и сама вершина."""
+        node_colors = {node: path_color for node in trace.way(step)}
+        node_colors[int(trace.order[step])] = index_color
+        return [node_colors.get(node, self.node_color) for node in self.graph.nodes()]
+
+    def replay(self, trace, path_color="red", index_color="green"):
+        """
+        Показывает записанные шаги обхода (SearchTrace) после поиска.
+
+        Граф рисуется один раз (если ещё не нарисован), на каждом шаге перекрашиваются только вершины.
+        """
+        if self.pos is None:
+            self.draw_graph()
+        for step in range(len(trace)):
+            self.node_collection.set_facecolor(self._frame_colors(trace, step, path_color, index_color))
+            plt.pause(self.plot_sleep)
+
+    def render(self, trace, filename, fps=2, dpi=100, layout=None, path_color="red", index_color="green"):
+        """
+        Сохраняет воспроизведение шагов обхода в файл без показа окна.
+
+        Формат выбирается по расширению: .gif пишется через Pillow, остальные (.mp4 и т. п.) — через ffmpeg.
+        """
+        from matplotlib.animation import FuncAnimation
+
+        if layout is not None:
+            self.layout = layout
+        figure = plt.figure(figsize=(8, 8))
+        try:
+            self._draw_static()
+
+            def frame(step):
+                self.node_collection.set_facecolor(self._frame_colors(trace, step, path_color, index_color))
+                return (self.node_collection,)
+
+            animation = FuncAnimation(figure, frame, frames=len(trace), blit=False, repeat=False)
+            writer = "pillow" if str(filename).lower().endswith(".gif") else "ffmpeg"
+            animation.save(filename, writer=writer, fps=fps, dpi=dpi)
+        finally:
+            plt.close(figure)
+
    
 
 